@@ -12,10 +12,15 @@ DB_PATH = DATA_DIR / "quant.duckdb"
 BATCH_HOUR = int(os.environ.get("BATCH_HOUR", "18"))   # 18시 KST (장 마감 후)
 BATCH_MINUTE = int(os.environ.get("BATCH_MINUTE", "0"))
 
+# Screener: 펀더멘털 분석 프로세스 수 (0 = CPU 코어 수)
+ANALYZE_WORKERS = int(os.environ.get("ANALYZE_WORKERS", "0"))
+
 # Web server
 HOST = os.environ.get("HOST", "0.0.0.0")
 PORT = int(os.environ.get("PORT", "5000"))
 DEBUG = os.environ.get("DEBUG", "false").lower() == "true"
+WEB_THREADS = int(os.environ.get("WEB_THREADS", "8"))  # gunicorn 워커 스레드 수 (gunicorn.conf.py)
+CACHE_WATCH_INTERVAL = float(os.environ.get("CACHE_WATCH_INTERVAL", "10"))  # DB 변경 감시 주기(초, 0 = 끔)
 
 # Claude API (for qualitative analysis reports)
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -7,6 +7,7 @@
 # =========================================================
 
 import logging
+import time
 from contextlib import contextmanager
 
 import duckdb
@@ -16,6 +17,10 @@ import config
 
 log = logging.getLogger("DB")
 
+# 테이블별 최신 collected_date 캐시 (웹 요청마다 MAX() 스캔 방지, save_df 시 무효화)
+LATEST_DATE_TTL = 60  # 초 — 다른 프로세스(수집기 단독 실행)의 쓰기도 이 시간 안에 반영
+_latest_date_cache: dict = {}
+
 # ─────────────────────────────────────────────
 # 테이블 스키마
 # ─────────────────────────────────────────────
@@ -223,6 +228,7 @@ def save_df(df: pd.DataFrame, table: str, collected_date: str):
             [collected_date],
         )
         _insert_df(conn, data, table)
+    _latest_date_cache.pop(table, None)
 
     log.info("저장: %s (%d건, date=%s)", table, len(data), collected_date)
 
@@ -257,7 +263,20 @@ def save_dashboard(df: pd.DataFrame):
 # 읽기
 # ─────────────────────────────────────────────
 
-def load_latest(table: str) -> pd.DataFrame:
+def load_latest(table: str, columns: list[str] | None = None,
+                filters: dict[str, list] | None = None) -> pd.DataFrame:
+    """최신 collected_date 스냅샷 로드.
+
+    columns: 필요한 컬럼만 SELECT (DuckDB 컬럼 스토리지라 나머지 컬럼은 읽지 않음)
+    filters: {컬럼: 허용값 목록} → WHERE 컬럼 IN (...) 로 DB에서 미리 거름
+    """
+    select = ", ".join(f'"{c}"' for c in columns) if columns else "*"
+    where = ""
+    params: list = []
+    for col, values in (filters or {}).items():
+        where += f' AND "{col}" IN ({", ".join("?" * len(values))})'
+        params.extend(values)
+
     with get_conn() as conn:
         try:
             cur = conn.execute(f"SELECT MAX(collected_date) FROM {table}")
@@ -270,8 +289,8 @@ def load_latest(table: str) -> pd.DataFrame:
 
         latest = row[0]
         df = conn.execute(
-            f"SELECT * FROM {table} WHERE collected_date = ?",
-            [latest],
+            f"SELECT {select} FROM {table} WHERE collected_date = ?{where}",
+            [latest, *params],
         ).df()
 
     if "collected_date" in df.columns:
@@ -281,6 +300,20 @@ def load_latest(table: str) -> pd.DataFrame:
     return df
 
 
+def table_fingerprint(table: str) -> tuple | None:
+    """테이블 내용 지문 (행 수, 전 행 해시 합) — 전체를 DataFrame으로 읽지 않고 변경 여부만 판단.
+
+    DB 파일 mtime은 보고서 저장 등 다른 테이블 쓰기에도 바뀌므로 캐시 무효화 확인용.
+    테이블이 없거나 조회에 실패하면 None (호출 측은 다시 로드).
+    """
+    with get_conn() as conn:
+        try:
+            row = conn.execute(f"SELECT COUNT(*), SUM(hash(t)) FROM {table} t").fetchone()
+        except Exception:
+            return None
+    return tuple(row) if row is not None else None
+
+
 def load_dashboard() -> pd.DataFrame:
     with get_conn() as conn:
         try:
@@ -350,16 +383,25 @@ def delete_report(code: str):
         )
 
 
+def latest_collected_date(conn, table: str) -> str | None:
+    """테이블의 최신 collected_date (LATEST_DATE_TTL 동안 캐시)"""
+    hit = _latest_date_cache.get(table)
+    now = time.monotonic()
+    if hit is not None and now - hit[1] < LATEST_DATE_TTL:
+        return hit[0]
+    row = conn.execute(f"SELECT MAX(collected_date) FROM {table}").fetchone()
+    latest = row[0] if row else None
+    _latest_date_cache[table] = (latest, now)
+    return latest
+
+
 def load_stock_financials(code: str) -> pd.DataFrame:
     """특정 종목의 연간 재무제표 시계열 (매출액/영업이익/당기순이익, 실적치만)"""
     with get_conn() as conn:
         try:
-            row = conn.execute(
-                "SELECT MAX(collected_date) FROM financial_statements"
-            ).fetchone()
-            if not row or not row[0]:
+            latest = latest_collected_date(conn, "financial_statements")
+            if not latest:
                 return pd.DataFrame()
-            latest = row[0]
             df = conn.execute(
                 """SELECT 기준일, 계정, 값
                    FROM financial_statements
@@ -0,0 +1,21 @@
+"""
+gunicorn 설정 — 프로젝트 루트에서 `gunicorn webapp.app:app` 실행 시 자동으로 읽힘.
+
+워커 프로세스 1개 + 스레드 N개 (gthread):
+  - 대시보드 캐시·파이프라인 실행 상태를 한 프로세스가 공유 (워커마다 DB 재로드·중복 실행 없음)
+  - DuckDB 파일은 한 프로세스만 열 수 있음
+  - 보고서 생성(Claude API 응답 대기) 중에도 다른 스레드가 조회 요청을 처리
+"""
+
+import config
+
+bind = f"{config.HOST}:{config.PORT}"
+worker_class = "gthread"
+workers = 1
+threads = config.WEB_THREADS
+
+
+def post_worker_init(worker):
+    """워커 준비 후 대시보드 캐시 감시 스레드 시작 (webapp.app import만으로는 띄우지 않음)."""
+    from webapp.app import start_cache_watcher
+    start_cache_watcher()
@@ -22,6 +22,8 @@ from quant_screener import (
     apply_turnaround_screen,
     save_to_excel,
     DATA_DIR,
+    FS_COLUMNS,
+    IND_GROUPS,
 )
 
 log = logging.getLogger("PIPELINE")
@@ -55,8 +57,8 @@ def run_pipeline(skip_collect: bool = False, test_mode: bool = False):
     log.info("Running screener...")
     master = load_table("master")
     daily = load_table("daily")
-    fs = load_table("financial_statements")
-    ind = load_table("indicators")
+    fs = load_table("financial_statements", columns=FS_COLUMNS)
+    ind = load_table("indicators", filters={"지표구분": IND_GROUPS})
     shares = load_table("shares")
     price_hist = load_table("price_history")
 
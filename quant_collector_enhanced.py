@@ -18,10 +18,13 @@
 import os
 import re
 import sys
+import time
+import random
 import logging
 import warnings
 import argparse
 from datetime import datetime, date, timedelta  # timedelta 추가
+from functools import lru_cache
 from io import StringIO
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -29,6 +32,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import FinanceDataReader as fdr
 from pykrx import stock
 from tqdm import tqdm
@@ -49,6 +53,9 @@ DATA_DIR = config.DATA_DIR
 
 MAX_WORKERS = 15          # FnGuide 동시 요청 수 (너무 높으면 차단됨)
 REQUEST_TIMEOUT = 12      # 초
+MAX_RETRIES = 4           # 일시 오류(네트워크/429/5xx) 재시도 횟수
+RETRY_BASE = 0.5          # 백오프 기본 대기 (초) — 0.5, 1, 2, ... + 지터
+RETRY_CAP = 8             # 백오프 최대 대기 (초)
 
 # 테스트용 샘플 종목 (대표 종목 선정)
 TEST_TICKERS = [
@@ -66,6 +73,10 @@ _session.headers.update({
         "Chrome/124.0.0.0 Safari/537.36"
     )
 })
+# 기본 커넥션 풀(10개)이 MAX_WORKERS보다 작으면 초과 커넥션이 매번 버려져 재연결(TLS 핸드셰이크) 발생
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
 
 
 # ═════════════════════════════════════════════
@@ -85,23 +96,52 @@ def get_biz_day() -> str:
     return d.strftime("%Y%m%d")
 
 
+def _retry_wait(attempt: int, resp=None) -> float:
+    """지수 백오프 + 지터 대기 시간. 서버가 Retry-After(초)를 주면 그 값을 따름"""
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(RETRY_CAP, int(retry_after))
+    return min(RETRY_CAP, RETRY_BASE * 2 ** attempt) + random.uniform(0, RETRY_BASE)
+
+
+def get_with_retry(url: str):
+    """GET + 일시 오류 재시도. 끝내 실패하면 None (종목 하나 때문에 배치가 멈추지 않도록)"""
+    for attempt in range(MAX_RETRIES):
+        resp = None
+        try:
+            resp = _session.get(url, timeout=REQUEST_TIMEOUT)
+            if resp.status_code != 429 and resp.status_code < 500:
+                resp.raise_for_status()
+                return resp
+        except requests.HTTPError:
+            return None  # 4xx(429 제외)는 재시도해도 결과가 같음
+        except requests.RequestException:
+            pass
+        if attempt < MAX_RETRIES - 1:
+            time.sleep(_retry_wait(attempt, resp))
+    log.debug(f"요청 실패 ({MAX_RETRIES}회 시도): {url}")
+    return None
+
+
 def load_tables(url: str) -> list:
     """FnGuide HTML 테이블 파싱 (인코딩 자동 감지)"""
-    try:
-        r = _session.get(url, timeout=REQUEST_TIMEOUT)
-        r.raise_for_status()
-    except Exception:
+    r = get_with_retry(url)
+    if r is None:
         return []
 
+    # 인코딩은 디코딩만으로 판별하고 HTML 파싱은 한 번만
+    # (테이블이 없는 페이지에서 인코딩마다 전체 파싱을 반복하지 않도록)
+    html = None
     for enc in ("cp949", "euc-kr", "utf-8"):
         try:
             html = r.content.decode(enc, errors="strict")
-            return pd.read_html(StringIO(html), displayed_only=False)
-        except Exception:
+            break
+        except UnicodeDecodeError:
             continue
-    # fallback
-    try:
+    if html is None:  # fallback
         html = r.content.decode("cp949", errors="replace")
+    try:
         return pd.read_html(StringIO(html), displayed_only=False)
     except Exception:
         return []
@@ -122,22 +162,45 @@ def safe_float(x):
         return None
 
 
+def safe_float_series(s: pd.Series) -> pd.Series:
+    """safe_float의 컬럼 단위 버전 — 쉼표 제거 후 한 번에 변환 (변환 불가·결측·inf → NaN)"""
+    if s.dtype.kind not in "biuf":
+        s = s.astype(str).str.replace(",", "", regex=False).str.strip()
+    out = pd.to_numeric(s, errors="coerce").astype(float)
+    return out.where(np.isfinite(out))
+
+
 def safe_int(x):
     v = safe_float(x)
     return int(v) if v is not None else None
 
 
+_PERIOD_RE = re.compile(r"(\d{4})[\./](\d{2})")
+
+
+@lru_cache(maxsize=1024)
 def parse_period(col_name: str):
-    """컬럼명에서 기준일 파싱 (2023/12, 2024.03 등)"""
+    """컬럼명에서 기준일 파싱 (2023/12, 2024.03 등)
+
+    셀마다 호출되지만 서로 다른 컬럼명은 수십 개뿐이라 결과를 캐시 (Timestamp는 불변)
+    """
     s = str(col_name)
     is_estimate = "(E)" in s
-    m = re.search(r"(\d{4})[\./](\d{2})", s)
+    m = _PERIOD_RE.search(s)
     if not m:
         return None, is_estimate
     d = pd.to_datetime(f"{m.group(1)}-{m.group(2)}") + pd.offsets.MonthEnd()
     return d, is_estimate
 
 
+def _parse_periods(periods: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """기간 컬럼 → (기준일, 추정치 여부) Series. melt 결과는 같은 컬럼명이 반복되므로 고유값만 파싱"""
+    parsed = {p: parse_period(p) for p in periods.unique()}
+    dates = periods.map({p: d for p, (d, _) in parsed.items()})
+    is_est = periods.map({p: e for p, (_, e) in parsed.items()}).astype(bool)
+    return dates, is_est
+
+
 def normalize_market(m: str) -> str:
     if not m:
         return "ETC"
@@ -155,10 +218,16 @@ def normalize_market(m: str) -> str:
 # 1. 종목 마스터
 # ═════════════════════════════════════════════
 
-def collect_master() -> pd.DataFrame:
-    """KRX 전종목 마스터 수집"""
+def collect_master(listing: pd.DataFrame | None = None) -> pd.DataFrame:
+    """KRX 전종목 마스터 수집
+
+    Args:
+        listing: 이미 받은 fdr.StockListing('KRX') 결과 (없으면 새로 요청)
+    """
     log.info("📘 종목 마스터 수집 중...")
-    df = fdr.StockListing("KRX")[["Code", "Name", "Market"]]
+    if listing is None:
+        listing = fdr.StockListing("KRX")
+    df = listing[["Code", "Name", "Market"]]
     df.columns = ["종목코드", "종목명", "시장구분"]
     df["시장구분"] = df["시장구분"].apply(normalize_market)
 
@@ -177,8 +246,12 @@ def collect_master() -> pd.DataFrame:
 # 2. 일별 시세 + 펀더멘털
 # ═════════════════════════════════════════════
 
-def collect_daily(biz_day: str) -> pd.DataFrame:
-    """FinanceDataReader를 이용한 시세 + 펀더멘털 수집"""
+def collect_daily(biz_day: str, listing: pd.DataFrame | None = None) -> pd.DataFrame:
+    """FinanceDataReader를 이용한 시세 + 펀더멘털 수집
+
+    Args:
+        listing: 이미 받은 fdr.StockListing('KRX') 결과 (없으면 새로 요청)
+    """
     # biz_day 포맷 변경 (YYYYMMDD -> YYYY-MM-DD) 필요 시 변환, 
     # 하지만 fdr.StockListing('KRX')는 '현재' 기준 가장 최신 데이터를 가져옵니다.
     # 과거 특정일 데이터를 가져오려면 복잡해지므로, 스크리너 목적상 '최신' 데이터로 진행합니다.
@@ -187,7 +260,7 @@ def collect_daily(biz_day: str) -> pd.DataFrame:
 
     # 1. KRX 전종목 리스팅 (가격, 시가총액, 거래량 등 포함됨)
     # fdr.StockListing('KRX')는 종가, 시가총액, 거래량 등을 기본 포함합니다.
-    df_krx = fdr.StockListing('KRX')
+    df_krx = listing if listing is not None else fdr.StockListing('KRX')
     
     # 컬럼 이름이 한글/영문 혼용될 수 있어 정리
     # (최신 fdr 버전에 따라 컬럼명이 다를 수 있으니 확인 후 매핑)
@@ -251,42 +324,44 @@ def collect_price_history(tickers: list[str], days: int = 260) -> pd.DataFrame:
 
     log.info(f"📈 주가 히스토리 수집 ({start_str} ~ {end_str}, {len(tickers)}개 종목)...")
 
-    all_rows = []
+    frames = []
+    price_cols = {"Open": "시가", "High": "고가", "Low": "저가",
+                  "Close": "종가", "Volume": "거래량", "Amount": "거래대금"}
 
-    def _fetch_one(ticker: str) -> list[dict]:
-        rows = []
+    def _fetch_one(ticker: str) -> pd.DataFrame | None:
         try:
             df = fdr.DataReader(ticker, start_str, end_str)
             if df is None or df.empty:
-                return rows
-            for dt, r in df.iterrows():
-                dt_str = dt.strftime("%Y-%m-%d") if hasattr(dt, "strftime") else str(dt)[:10]
-                rows.append({
-                    "종목코드": ticker,
-                    "날짜": dt_str,
-                    "시가": safe_float(r.get("Open")),
-                    "고가": safe_float(r.get("High")),
-                    "저가": safe_float(r.get("Low")),
-                    "종가": safe_float(r.get("Close")),
-                    "거래량": safe_float(r.get("Volume")),
-                    "거래대금": safe_float(r.get("Amount") if "Amount" in r.index else None),
-                })
+                return None
+            # 행마다 iterrows + safe_float 대신 컬럼 단위로 한 번에 변환 (변환 불가·inf → NaN)
+            idx = df.index
+            out = pd.DataFrame({
+                "종목코드": ticker,
+                "날짜": (idx.strftime("%Y-%m-%d") if isinstance(idx, pd.DatetimeIndex)
+                        else idx.astype(str).str[:10]),
+            })
+            for src, dst in price_cols.items():
+                out[dst] = (pd.to_numeric(df[src], errors="coerce").to_numpy(dtype=float)
+                            if src in df.columns else np.nan)
+            return out.replace([np.inf, -np.inf], np.nan)
         except Exception as e:
             log.debug(f"주가 히스토리 수집 실패: {ticker} → {e}")
-        return rows
+        return None
 
     with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, 10)) as pool:
         futures = {pool.submit(_fetch_one, t): t for t in tickers}
         for f in tqdm(as_completed(futures), total=len(futures), desc="주가 히스토리", ncols=100):
             try:
                 result = f.result()
-                all_rows.extend(result)
+                if result is not None:
+                    frames.append(result)
             except Exception as e:
                 ticker = futures[f]
                 log.warning(f"주가 히스토리 처리 실패: {ticker} → {str(e)[:100]}")
 
+    all_rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     log.info(f"  → 주가 히스토리 {len(all_rows)}건 수집 완료")
-    return pd.DataFrame(all_rows) if all_rows else pd.DataFrame()
+    return all_rows
 
 
 # ═════════════════════════════════════════════
@@ -323,23 +398,19 @@ def _melt_fs(df: pd.DataFrame, ticker: str, freq: str) -> list[dict]:
     except Exception:
         return []
 
-    rows = []
-    for _, r in melted.iterrows():
-        biz_date, is_est = parse_period(r["기간"])
-        if biz_date is None:
-            continue
-        val = safe_float(r["값"])
-        if val is None:
-            continue
-        rows.append({
-            "종목코드": ticker,
-            "기준일": biz_date,
-            "계정": r["계정"],
-            "주기": freq,
-            "값": val,
-            "추정치": is_est,
-        })
-    return rows
+    # 행마다 iterrows + safe_float 대신 컬럼 단위로 변환 (기간 파싱은 고유 컬럼명당 한 번)
+    dates, is_est = _parse_periods(melted["기간"])
+    vals = safe_float_series(melted["값"])
+    keep = dates.notna() & vals.notna()
+    out = pd.DataFrame({
+        "종목코드": ticker,
+        "기준일": dates[keep],
+        "계정": melted["계정"][keep],
+        "주기": freq,
+        "값": vals[keep],
+        "추정치": is_est[keep],
+    })
+    return out.to_dict(orient="records")
 
 
 def fetch_fs(ticker: str) -> list[dict]:
@@ -394,35 +465,39 @@ def _extract_indicator_rows(
     except Exception:
         return []
 
-    rows = []
-    for _, r in melted.iterrows():
-        biz_date, is_est = parse_period(r["기간"])
-        if biz_date is None:
-            continue
-        account = str(r["계정"]).strip()
-        if not account or account.lower() in ("nan", "none"):
-            continue
-        val = safe_float(r["값"])
-        rows.append({
-            "종목코드": ticker,
-            "기준일": biz_date,
-            "지표구분": f"{source}_E" if is_est else source,
-            "계정": account,
-            "값": val,
-        })
-    return rows
-
+    dates, is_est = _parse_periods(melted["기간"])
+    accounts = melted["계정"].astype(str).str.strip()
+    keep = (dates.notna() & melted["계정"].notna()
+            & ~accounts.str.lower().isin(["", "nan", "none"]))
+    vals = safe_float_series(melted["값"])[keep]
+    out = pd.DataFrame({
+        "종목코드": ticker,
+        "기준일": dates[keep],
+        "지표구분": np.where(is_est[keep], f"{source}_E", source),
+        "계정": accounts[keep],
+        "값": vals.astype(object).where(vals.notna(), None),
+    })
+    return out.to_dict(orient="records")
 
-def fetch_indicators(ticker: str) -> list[dict]:
-    """Financial Highlight + 재무비율 + 배당금 수집"""
-    rows = []
 
-    # ── (A) 메인 페이지: Financial Highlight + DPS ──
-    url_main = (
+def _main_url(ticker: str) -> str:
+    """FnGuide 메인(Snapshot) 페이지 — 핵심지표와 주식수가 같은 페이지에 있음"""
+    return (
         f"https://comp.fnguide.com/SVO2/ASP/SVD_Main.asp"
         f"?pGB=1&gicode=A{ticker}&stkGb=701"
     )
-    main_tables = load_tables(url_main)
+
+
+def fetch_indicators(ticker: str, main_tables: list | None = None) -> list[dict]:
+    """Financial Highlight + 재무비율 + 배당금 수집
+
+    main_tables: 이미 받아 둔 메인 페이지 테이블 (없으면 직접 요청)
+    """
+    rows = []
+
+    # ── (A) 메인 페이지: Financial Highlight + DPS ──
+    if main_tables is None:
+        main_tables = load_tables(_main_url(ticker))
 
     for t in main_tables:
         if not isinstance(t, pd.DataFrame) or t.shape[0] < 2 or t.shape[1] < 2:
@@ -487,13 +562,13 @@ def fetch_indicators(ticker: str) -> list[dict]:
 # 5. 주식수 (FnGuide)
 # ═════════════════════════════════════════════
 
-def fetch_shares(ticker: str) -> dict | None:
-    """발행주식수, 자사주, 유통주식수 수집"""
-    url = (
-        f"https://comp.fnguide.com/SVO2/ASP/SVD_Main.asp"
-        f"?pGB=1&gicode=A{ticker}&stkGb=701"
-    )
-    tables = load_tables(url)
+def fetch_shares(ticker: str, tables: list | None = None) -> dict | None:
+    """발행주식수, 자사주, 유통주식수 수집
+
+    tables: 이미 받아 둔 메인 페이지 테이블 (없으면 직접 요청)
+    """
+    if tables is None:
+        tables = load_tables(_main_url(ticker))
     if not tables:
         return None
 
@@ -525,6 +600,14 @@ def fetch_shares(ticker: str) -> dict | None:
     }
 
 
+def fetch_indicators_and_shares(ticker: str) -> tuple[list[dict], dict | None]:
+    """메인 페이지를 한 번만 받아 핵심지표와 주식수를 함께 수집 (종목당 요청 1회 절감)"""
+    main_tables = load_tables(_main_url(ticker))
+    # fetch_indicators가 테이블 컬럼을 평탄화하므로 주식수를 먼저 파싱
+    shares = fetch_shares(ticker, main_tables)
+    return fetch_indicators(ticker, main_tables), shares
+
+
 # ═════════════════════════════════════════════
 # 병렬 수집 래퍼
 # ═════════════════════════════════════════════
@@ -665,20 +748,25 @@ def run_full(test_mode: bool = False):
     if test_mode:
         log.info(f"🧪 테스트 모드: {len(TEST_TICKERS)}개 종목만 수집")
 
+    # 마스터·일별 시세는 같은 KRX 리스팅을 사용 → 이번 실행에서 한 번만 요청
+    has_master = _db.table_has_data("master", biz_day)
+    has_daily = _db.table_has_data("daily", biz_day)
+    listing = None if has_master and has_daily else fdr.StockListing("KRX")
+
     # ── 1) 마스터 ──
-    if _db.table_has_data("master", biz_day):
+    if has_master:
         log.info("📂 master 데이터가 DB에 있어 로드합니다.")
         master = _db.load_latest("master")
     else:
-        master = collect_master()
+        master = collect_master(listing)
         _db.save_df(master, "master", biz_day)
 
     # ── 2) 일별 시세 ──
-    if _db.table_has_data("daily", biz_day):
+    if has_daily:
         log.info("📂 daily 데이터가 DB에 있어 로드합니다.")
         daily = _db.load_latest("daily")
     else:
-        daily = collect_daily(biz_day)
+        daily = collect_daily(biz_day, listing)
         _db.save_df(daily, "daily", biz_day)
 
     # 보통주만 추출 (FnGuide 크롤링 대상)
@@ -709,21 +797,31 @@ def run_full(test_mode: bool = False):
         else:
             log.warning("⚠️ 재무제표 데이터 없음")
 
-    # ── 4) 핵심 지표 ──
-    if _db.table_has_data("indicators", biz_day):
+    # ── 4) 핵심 지표 / 5) 주식수 ──
+    # 둘 다 필요하면 같은 메인 페이지를 종목당 한 번만 받아 함께 파싱
+    need_ind = not _db.table_has_data("indicators", biz_day)
+    need_shares = not _db.table_has_data("shares", biz_day)
+    ind_rows = share_rows = None
+    if need_ind and need_shares:
+        pairs = parallel_collect(fetch_indicators_and_shares, targets, "핵심지표+주식수")
+        ind_rows = [r for rows, _ in pairs for r in rows]
+        share_rows = [s for _, s in pairs if s]
+
+    if not need_ind:
         log.info("⏭️  indicators 이미 존재하여 수집 건너뜀")
     else:
-        ind_rows = parallel_collect(fetch_indicators, targets, "핵심지표")
+        if ind_rows is None:
+            ind_rows = parallel_collect(fetch_indicators, targets, "핵심지표")
         if ind_rows:
             _db.save_df(pd.DataFrame(ind_rows), "indicators", biz_day)
         else:
             log.warning("⚠️ 핵심지표 데이터 없음")
 
-    # ── 5) 주식수 ──
-    if _db.table_has_data("shares", biz_day):
+    if not need_shares:
         log.info("⏭️  shares 이미 존재하여 수집 건너뜀")
     else:
-        share_rows = parallel_collect(fetch_shares, targets, "주식수")
+        if share_rows is None:
+            share_rows = parallel_collect(fetch_shares, targets, "주식수")
         if share_rows:
             _db.save_df(pd.DataFrame(share_rows), "shares", biz_day)
         else:
@@ -25,9 +25,15 @@
 #   7) quant_dividend_growth.xlsx — 배당 성장주 (수익+배당 동반증가)
 # =========================================================
 
+import os
 import sys
 import logging
+import multiprocessing
 import re
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
 from pathlib import Path
 
 import numpy as np
@@ -38,20 +44,31 @@ import config
 try:
     from tqdm import tqdm
 except ImportError:
-    def tqdm(iterable, desc="", **kwargs):
-        items = list(iterable)
-        total = len(items)
-        for i, item in enumerate(items):
-            if i % max(1, total // 10) == 0:
-                print(f"  {desc}: {i}/{total} ({i*100//total}%)")
+    def tqdm(iterable, desc="", total=None, **kwargs):
+        # 이터러블을 list로 만들지 않고 그대로 흘려보냄 (제너레이터/pool.map 결과도 지연 소비)
+        if total is None and hasattr(iterable, "__len__"):
+            total = len(iterable)
+        step = max(1, total // 10) if total else 0
+        count = 0
+        for item in iterable:
+            if step and count % step == 0:
+                print(f"  {desc}: {count}/{total} ({count*100//total}%)")
+            count += 1
             yield item
-        print(f"  {desc}: {total}/{total} (100%)")
+        print(f"  {desc}: {count}/{total or count} (100%)")
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 log = logging.getLogger("SCREENER")
 
 DATA_DIR = config.DATA_DIR
 
+# 이 종목 수 이상일 때만 펀더멘털 분석을 프로세스 풀로 분산 (소규모는 프로세스 기동 비용이 더 큼)
+PARALLEL_MIN_TICKERS = 500
+
+# 스크리너가 실제로 쓰는 재무제표 컬럼 / 지표구분만 DB에서 로드 (추정치 컬럼·행은 읽지 않음)
+FS_COLUMNS = ["종목코드", "기준일", "계정", "주기", "값"]
+IND_GROUPS = ["RATIO_Y", "RATIO_Q", "DPS"]
+
 
 # ─────────────────────────────────────────────
 # 계정 매핑 (exact match용)
@@ -73,10 +90,13 @@ EXACT_ACCOUNTS = {
     "유동부채": ["유동부채"],
     "매출총이익": ["매출총이익"],
 }
+# 역매핑: exact 계정명 → target_key (계정명은 키 사이에 중복되지 않음)
+ACCOUNT_KEY_BY_NAME = {name: key for key, names in EXACT_ACCOUNTS.items() for name in names}
 
 EXCLUDE_KEYWORDS = [
     "증가율", "(-1Y)", "(평균)", "률(", "비율", "배율", "(-1A", "(-1Q", "/ 수정평균"
 ]
+EXCLUDE_RE = re.compile("|".join(map(re.escape, EXCLUDE_KEYWORDS)))
 
 
 # ═════════════════════════════════════════════
@@ -95,9 +115,18 @@ def normalize_code(x):
         return np.nan
 
 
-def load_table(prefix: str) -> pd.DataFrame:
+def normalize_code_series(codes: pd.Series) -> pd.Series:
+    """normalize_code의 벡터화 버전 (pandas 문자열 커널로 처리, 행 단위 파이썬 호출 없음)"""
+    s = codes.astype("string").str.strip()
+    s = s.where(s != "")
+    s = s.str.split(".", n=1).str[0].str.zfill(6)
+    return pd.Series(s.to_numpy(dtype=object, na_value=np.nan), index=codes.index, name=codes.name)
+
+
+def load_table(prefix: str, columns: list[str] | None = None,
+               filters: dict[str, list] | None = None) -> pd.DataFrame:
     import db as _db
-    df = _db.load_latest(prefix)
+    df = _db.load_latest(prefix, columns=columns, filters=filters)
 
     if df.empty:
         return df
@@ -105,7 +134,7 @@ def load_table(prefix: str) -> pd.DataFrame:
     df.columns = df.columns.str.strip()
 
     if "종목코드" in df.columns:
-        df["종목코드"] = df["종목코드"].apply(normalize_code)
+        df["종목코드"] = normalize_code_series(df["종목코드"])
         df = df.dropna(subset=["종목코드"])
 
     # 기준일 정규화: "2023-12-31 00:00:00" → "2023-12-31"
@@ -115,6 +144,11 @@ def load_table(prefix: str) -> pd.DataFrame:
     for col in ["값", "종가", "시가총액", "상장주식수"]:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # 반복 비교되는 저카디널리티 문자열 컬럼은 category로 (==/isin이 정수 코드 비교로 처리됨)
+    for col in ["계정", "지표구분", "주기"]:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
     return df
 
 
@@ -123,32 +157,38 @@ load_csv = load_table
 
 
 def _should_exclude(account_name: str) -> bool:
-    for kw in EXCLUDE_KEYWORDS:
-        if kw in account_name:
-            return True
-    return False
+    return EXCLUDE_RE.search(account_name) is not None
+
+
+@lru_cache(maxsize=None)
+def _targets_for(target_key):
+    """target_key의 exact 매칭 계정명 튜플 (EXACT_ACCOUNTS에 없으면 key 자체)"""
+    return tuple(EXACT_ACCOUNTS.get(target_key, [target_key]))
+
+
+@lru_cache(maxsize=None)
+def _fallback_keys_for(name_str):
+    """계정명이 startswith fallback으로 매칭되는 target_key 튜플 (제외 키워드 포함 시 빈 튜플)"""
+    if _should_exclude(name_str):
+        return ()
+    return tuple(key for key, targets in EXACT_ACCOUNTS.items()
+                 if any(name_str.startswith(t) for t in targets))
 
 
 def find_account_value(df, target_key, date_filter=None):
     if df.empty or "계정" not in df.columns:
         return {}
 
-    targets = EXACT_ACCOUNTS.get(target_key, [target_key])
-    work = df.copy()
-    if date_filter is not None:
-        work = work[work["기준일"].isin(date_filter)]
+    targets = _targets_for(target_key)
+    # 읽기 전용 필터링이므로 복사 없이 원본(또는 날짜 필터 결과)을 그대로 사용
+    work = df if date_filter is None else df[df["기준일"].isin(date_filter)]
 
     mask = work["계정"].isin(targets)
     matched = work[mask]
 
     if matched.empty:
-        def _startswith_any(name):
-            name_str = str(name)
-            for t in targets:
-                if name_str.startswith(t) and not _should_exclude(name_str):
-                    return True
-            return False
-        mask2 = work["계정"].apply(_startswith_any)
+        names = work["계정"].astype(str)
+        mask2 = names.str.startswith(targets) & ~names.str.contains(EXCLUDE_RE)
         matched = work[mask2]
 
     if matched.empty:
@@ -156,19 +196,141 @@ def find_account_value(df, target_key, date_filter=None):
 
     matched = matched.drop_duplicates(["종목코드", "기준일"], keep="first")
 
-    result = {}
-    for _, r in matched.iterrows():
-        try:
-            dt = str(r["기준일"])
-            v = float(r["값"]) if pd.notna(r["값"]) else None
-            if v is not None:
-                result[dt] = v
-        except (ValueError, TypeError, KeyError):
-            # 값 변환 실패 시 무시
-            pass
+    # 행마다 Series를 만드는 iterrows 대신 컬럼 배열을 한 번에 변환 (변환 실패 값은 NaN → 제외)
+    dates = matched["기준일"].astype(str).to_numpy()
+    vals = pd.to_numeric(matched["값"], errors="coerce").to_numpy(dtype=float)
+    keep = ~np.isnan(vals)
+    return dict(zip(dates[keep].tolist(), vals[keep].tolist()))
+
+
+def build_account_index(df, by):
+    """계정 행을 그룹별 {target_key: (exact_rows, fallback_rows)} 로 한 번에 분류.
+
+    rows는 원본 행 순서의 (기준일, 값, 주기) 튜플. 종목·계정마다 프레임을 다시 훑는
+    find_account_value 대신 lookup_account_value의 dict 조회로 같은 결과를 얻는다.
+    by가 문자열이면 그 컬럼 값, 리스트면 컬럼 값 튜플이 그룹 키.
+    """
+    index = {}
+    if df.empty or "계정" not in df.columns:
+        return index
+
+    fallback_keys = {}
+    for name in df["계정"].dropna().unique():
+        keys = _fallback_keys_for(str(name))
+        if keys:
+            fallback_keys[name] = keys
+
+    sub = df[df["계정"].isin(ACCOUNT_KEY_BY_NAME.keys() | fallback_keys.keys())]
+    if isinstance(by, str):
+        groups = sub[by].to_numpy()
+    else:
+        groups = list(zip(*(sub[c].to_numpy() for c in by)))
+    periods = sub["주기"].to_numpy() if "주기" in sub.columns else [None] * len(sub)
+    rows = zip(sub["기준일"].astype(str).to_numpy(), sub["값"].to_numpy(), periods)
+
+    for group, name, row in zip(groups, sub["계정"].to_numpy(), rows):
+        accounts = index.setdefault(group, {})
+        key = ACCOUNT_KEY_BY_NAME.get(name)
+        if key is not None:
+            accounts.setdefault(key, ([], []))[0].append(row)
+        for key in fallback_keys.get(name, ()):
+            accounts.setdefault(key, ([], []))[1].append(row)
+    return index
+
+
+def lookup_account_value(accounts, target_key, date_filter=None, period=None):
+    """build_account_index 결과에서 find_account_value와 같은 규칙으로 {기준일: 값} 추출.
+
+    (필터 후) exact 매칭이 하나라도 있으면 exact만, 없으면 startswith fallback 사용.
+    같은 기준일은 원본 순서상 첫 행만 채택.
+    """
+    if not accounts or target_key not in accounts:
+        return {}
+    dates = set(map(str, date_filter)) if date_filter is not None else None
+
+    for rows in accounts[target_key]:
+        rows = [r for r in rows
+                if (dates is None or r[0] in dates) and (period is None or r[2] == period)]
+        if rows:
+            break
+
+    result, seen = {}, set()
+    for dt, v, _ in rows:
+        if dt in seen:
+            continue
+        seen.add(dt)
+        if pd.notna(v):
+            try:
+                result[dt] = float(v)
+            except (ValueError, TypeError):
+                pass
     return result
 
 
+def build_date_index(ind_df):
+    """(종목코드, 지표구분) → (정렬된 기준일 목록, 그중 연말(12-31) 기준일 목록).
+
+    연말 여부는 전체 프레임에서 str.endswith 한 번으로 판정 (종목마다 문자열 검사 반복 없음).
+    """
+    index = {}
+    if ind_df.empty or "지표구분" not in ind_df.columns:
+        return index
+    d = (ind_df[["종목코드", "지표구분", "기준일"]]
+         .drop_duplicates()
+         .sort_values(["종목코드", "지표구분", "기준일"]))
+    annual = d["기준일"].astype(str).str.endswith("12-31").to_numpy()
+    keys = zip(d["종목코드"].to_numpy(), d["지표구분"].to_numpy())
+    for key, dt, is_annual in zip(keys, d["기준일"].to_numpy(), annual):
+        dates, annual_dates = index.setdefault(key, ([], []))
+        dates.append(dt)
+        if is_annual:
+            annual_dates.append(dt)
+    return index
+
+
+TTM_KEYS = ("매출액", "영업이익", "순이익")
+
+
+def build_quarterly_ttm(ind_df):
+    """종목별 최근 4개 분기(RATIO_Q) 합계 {종목코드: {계정키: 값}} 를 전 종목 한 번에 계산.
+
+    lookup_account_value와 같은 규칙 — 최근 4개 분기 기준일 안에 exact 매칭이 있으면 exact만,
+    없으면 startswith fallback, 같은 기준일은 첫 행만. 4개 분기 값이 모두 있는 키만 포함.
+    """
+    if ind_df.empty or "지표구분" not in ind_df.columns:
+        return {}
+    q = ind_df[ind_df["지표구분"] == "RATIO_Q"]
+    if q.empty:
+        return {}
+
+    # 종목별 최근 4개 분기 기준일 (계정 무관 — date_index의 q_dates[-4:]와 동일)
+    dates = q[["종목코드", "기준일"]].drop_duplicates().sort_values(["종목코드", "기준일"])
+    last4 = dates[dates.groupby("종목코드").cumcount(ascending=False) < 4]
+    q = q[pd.MultiIndex.from_frame(q[["종목코드", "기준일"]]).isin(
+        pd.MultiIndex.from_frame(last4))]
+
+    # 계정명 → key 분류는 고유 계정명 단위로 한 번만 (행마다 문자열 검사 없음)
+    exact_keys = q["계정"].map(ACCOUNT_KEY_BY_NAME)
+    fallback_keys = {n: _fallback_keys_for(str(n)) for n in q["계정"].dropna().unique()}
+    parts = []
+    for key in TTM_KEYS:
+        exact = q[exact_keys == key]
+        fb_names = [n for n, keys in fallback_keys.items() if key in keys]
+        fallback = q[q["계정"].isin(fb_names) & ~q["종목코드"].isin(exact["종목코드"].unique())]
+        parts.append(pd.concat([exact, fallback])[["종목코드", "기준일", "값"]].assign(_key=key))
+
+    rows = (pd.concat(parts)
+            .drop_duplicates(["종목코드", "_key", "기준일"], keep="first")
+            .dropna(subset=["값"]))
+    agg = rows.groupby(["종목코드", "_key"], sort=False)["값"].agg(["sum", "count"])
+    agg = agg[agg["count"] == 4]
+
+    index = {}
+    for (ticker, key), val in zip(agg.index, agg["sum"].to_numpy()):
+        index.setdefault(ticker, {})[key] = float(val)
+    return index
+
+
 # ═════════════════════════════════════════════
 # 데이터 전처리 & 단위 감지
 # ═════════════════════════════════════════════
@@ -209,13 +371,13 @@ def detect_unit_multiplier(ind_df):
 def calc_cagr(series_dict, min_years=2):
     if len(series_dict) < min_years:
         return np.nan
-    dates = sorted(series_dict.keys())
-    v0, v1 = series_dict[dates[0]], series_dict[dates[-1]]
+    # 키는 ISO 'YYYY-MM-DD' 문자열 → 사전순 = 시간순이므로 정렬 없이 min/max
+    first, last = min(series_dict), max(series_dict)
+    v0, v1 = series_dict[first], series_dict[last]
     if v0 <= 0 or v1 <= 0:
         return np.nan
     try:
-        d0, d1 = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
-        years = (d1 - d0).days / 365.25
+        years = (date.fromisoformat(last[:10]) - date.fromisoformat(first[:10])).days / 365.25
         if years < 0.5: return np.nan
         return ((v1 / v0) ** (1 / years) - 1) * 100
     except:
@@ -225,7 +387,7 @@ def calc_cagr(series_dict, min_years=2):
 def count_consecutive_growth(series_dict):
     if len(series_dict) < 2:
         return 0
-    vals = [series_dict[d] for d in sorted(series_dict.keys())]
+    vals = [v for _, v in sorted(series_dict.items())]
     count = 0
     for i in range(len(vals) - 1, 0, -1):
         if vals[i] > vals[i - 1] and vals[i - 1] > 0:
@@ -249,9 +411,13 @@ def _prev_year_date(date_str):
         return None
 
 
-def calc_quarterly_yoy(q_data, key):
+def calc_quarterly_yoy(q_dates, vals):
     """분기별 전년동기비(YoY) 성장률을 계산.
 
+    Args:
+        q_dates: 종목의 분기(RATIO_Q) 기준일 목록
+        vals: 해당 계정의 {분기 기준일: 값}
+
     Returns:
         dict: {
             'latest_yoy': float or NaN (최근 분기 YoY %),
@@ -267,12 +433,9 @@ def calc_quarterly_yoy(q_data, key):
         "yoy_series": {},
     }
 
-    q_dates = sorted(q_data["기준일"].unique())
     if len(q_dates) < 5:  # 최소 5개 분기 (4분기 + 전년 1개)
         return result
 
-    # 분기별 값 추출
-    vals = find_account_value(q_data, key)
     if len(vals) < 5:
         return result
 
@@ -310,9 +473,13 @@ def calc_quarterly_yoy(q_data, key):
     return result
 
 
-def calc_ttm_yoy(q_data, key):
+def calc_ttm_yoy(q_dates, vals):
     """TTM(최근 4분기 합) vs 전년 TTM(1년 전 4분기 합) 비교.
 
+    Args:
+        q_dates: 종목의 분기(RATIO_Q) 기준일 목록
+        vals: 해당 계정의 {분기 기준일: 값}
+
     Returns:
         dict: {
             'ttm_current': float or NaN,
@@ -322,11 +489,9 @@ def calc_ttm_yoy(q_data, key):
     """
     result = {"ttm_current": np.nan, "ttm_prev": np.nan, "ttm_yoy": np.nan}
 
-    q_dates = sorted(q_data["기준일"].unique())
     if len(q_dates) < 8:  # 최근 4분기 + 전년 4분기
         return result
 
-    vals = find_account_value(q_data, key)
     if len(vals) < 8:
         return result
 
@@ -352,31 +517,49 @@ def calc_ttm_yoy(q_data, key):
 # 종목별 펀더멘털 분석 (v6: 턴어라운드/캐시카우 필드 추가)
 # ═════════════════════════════════════════════
 
-def analyze_one_stock(ticker, ind_grp, fs_grp):
+def analyze_one_stock(ticker, ind_grp, fs_grp, ind_index=None, fs_index=None, date_index=None,
+                      ttm_index=None):
+    """종목 하나의 펀더멘털 지표 계산.
+
+    ind_index / fs_index / date_index / ttm_index는 analyze_all에서 전체 프레임으로 미리 만든
+    build_account_index / build_date_index / build_quarterly_ttm 결과.
+    생략하면 이 종목의 그룹 프레임으로 직접 만든다.
+    """
     result = {"종목코드": ticker}
     has_ind = not ind_grp.empty and "지표구분" in ind_grp.columns
     has_fs = not fs_grp.empty
 
+    # 지표구분별 분할은 종목당 한 번만 (이후 블록은 모두 재사용)
+    if has_ind:
+        if ind_index is None:
+            ind_index = build_account_index(ind_grp, ["종목코드", "지표구분"])
+        y_acc = ind_index.get((ticker, "RATIO_Y"), {})
+        q_acc = ind_index.get((ticker, "RATIO_Q"), {})
+        dps_acc = ind_index.get((ticker, "DPS"), {})
+
+        if date_index is None:
+            date_index = build_date_index(ind_grp)
+        _, annual_dates = date_index.get((ticker, "RATIO_Y"), ([], []))
+        q_dates, _ = date_index.get((ticker, "RATIO_Q"), ([], []))
+        _, annual_dps = date_index.get((ticker, "DPS"), ([], []))
+    if has_fs:
+        if fs_index is None:
+            fs_index = build_account_index(fs_grp, "종목코드")
+        fs_acc = fs_index.get(ticker, {})
+
     # ── TTM (Trailing 12 Months) ──
     ttm_rev, ttm_op, ttm_ni = np.nan, np.nan, np.nan
     ttm_source = "없음"
 
     if has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        q_data = ind_grp[ind_grp["지표구분"] == "RATIO_Q"]
-
-        y_dates = sorted(y_data["기준일"].unique())
-        annual_dates = [d for d in y_dates if str(d).endswith("12-31")]
-        q_dates = sorted(q_data["기준일"].unique())
-        last4q = q_dates[-4:] if len(q_dates) >= 4 else []
+        if ttm_index is None:
+            ttm_index = build_quarterly_ttm(ind_grp)
+        q_ttm = ttm_index.get(ticker, {})
 
         for label, key, setter in [("매출", "매출액", "ttm_rev"), ("영업이익", "영업이익", "ttm_op"), ("순이익", "순이익", "ttm_ni")]:
-            val = np.nan
-            if last4q:
-                d = find_account_value(q_data[q_data["기준일"].isin(last4q)], key)
-                if len(d) >= 4: val = sum(d.values())
+            val = q_ttm.get(key, np.nan)
             if pd.isna(val) and annual_dates:
-                d = find_account_value(y_data, key, annual_dates)
+                d = lookup_account_value(y_acc, key, annual_dates)
                 if d: val = d[max(d.keys())]
 
             if setter == "ttm_rev": ttm_rev = val
@@ -389,21 +572,19 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
 
     # ── 계절성 통제: 분기별 YoY 성장률 & TTM YoY ──
     if has_ind:
-        q_data_all = ind_grp[ind_grp["지표구분"] == "RATIO_Q"]
-
         for label, key in [("매출", "매출액"), ("영업이익", "영업이익"), ("순이익", "순이익")]:
             # 분기별 YoY (전년동기비)
-            qyoy = calc_quarterly_yoy(q_data_all, key)
+            q_vals = lookup_account_value(q_acc, key)
+            qyoy = calc_quarterly_yoy(q_dates, q_vals)
             result[f"Q_{label}_YoY(%)"] = qyoy["latest_yoy"]
             result[f"Q_{label}_연속YoY성장"] = qyoy["consecutive_yoy_growth"]
 
             # TTM YoY (최근4분기 합 vs 전년4분기 합)
-            ttm_yoy = calc_ttm_yoy(q_data_all, key)
+            ttm_yoy = calc_ttm_yoy(q_dates, q_vals)
             result[f"TTM_{label}_YoY(%)"] = ttm_yoy["ttm_yoy"]
 
         # 최근 분기 날짜 (참조용)
-        q_dates_sorted = sorted(q_data_all["기준일"].unique())
-        result["최근분기"] = q_dates_sorted[-1] if q_dates_sorted else ""
+        result["최근분기"] = q_dates[-1] if q_dates else ""
     else:
         for label in ["매출", "영업이익", "순이익"]:
             result[f"Q_{label}_YoY(%)"] = np.nan
@@ -415,16 +596,14 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
     curr_equity, curr_debt = np.nan, np.nan
     if has_fs:
         last_dt = sorted(fs_grp["기준일"].unique())[-1]
-        bs_last = fs_grp[fs_grp["기준일"] == last_dt]
-        e = find_account_value(bs_last, "자본")
-        d = find_account_value(bs_last, "부채")
+        e = lookup_account_value(fs_acc, "자본", [last_dt])
+        d = lookup_account_value(fs_acc, "부채", [last_dt])
         if e: curr_equity = list(e.values())[0]
         if d: curr_debt = list(d.values())[0]
 
     if pd.isna(curr_equity) and has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        e = find_account_value(y_data, "자본")
-        d = find_account_value(y_data, "부채")
+        e = lookup_account_value(y_acc, "자본")
+        d = lookup_account_value(y_acc, "부채")
         if e: curr_equity = e[max(e.keys())]
         if d: curr_debt = d[max(d.keys())]
 
@@ -436,34 +615,28 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
     gross_profit_series = {}
 
     if has_fs:
-        fs_y = fs_grp[fs_grp["주기"] == "y"]
-        total_assets_series = find_account_value(fs_y, "자산총계")
-        current_assets_series = find_account_value(fs_y, "유동자산")
-        current_liab_series = find_account_value(fs_y, "유동부채")
-        gross_profit_series = find_account_value(fs_y, "매출총이익")
-        debt_series = find_account_value(fs_y, "부채")
-        equity_series = find_account_value(fs_y, "자본")
+        total_assets_series = lookup_account_value(fs_acc, "자산총계", period="y")
+        current_assets_series = lookup_account_value(fs_acc, "유동자산", period="y")
+        current_liab_series = lookup_account_value(fs_acc, "유동부채", period="y")
+        gross_profit_series = lookup_account_value(fs_acc, "매출총이익", period="y")
+        debt_series = lookup_account_value(fs_acc, "부채", period="y")
+        equity_series = lookup_account_value(fs_acc, "자본", period="y")
 
     # indicators fallback (BS 데이터)
     if not total_assets_series and has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        total_assets_series = find_account_value(y_data, "자산총계")
+        total_assets_series = lookup_account_value(y_acc, "자산총계")
     if not debt_series and has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        debt_series = find_account_value(y_data, "부채")
-        equity_series = find_account_value(y_data, "자본")
+        debt_series = lookup_account_value(y_acc, "부채")
+        equity_series = lookup_account_value(y_acc, "자본")
 
     result["자산총계"] = total_assets_series[max(total_assets_series.keys())] if total_assets_series else np.nan
 
     # ── 성장성 (CAGR) ──
     rev_series, op_series, ni_series = {}, {}, {}
-    if has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        annual_dates = [d for d in sorted(y_data["기준일"].unique()) if str(d).endswith("12-31")]
-        if len(annual_dates) >= 2:
-            rev_series = find_account_value(y_data, "매출액", annual_dates)
-            op_series = find_account_value(y_data, "영업이익", annual_dates)
-            ni_series = find_account_value(y_data, "순이익", annual_dates)
+    if has_ind and len(annual_dates) >= 2:
+        rev_series = lookup_account_value(y_acc, "매출액", annual_dates)
+        op_series = lookup_account_value(y_acc, "영업이익", annual_dates)
+        ni_series = lookup_account_value(y_acc, "순이익", annual_dates)
 
     result["매출_CAGR"] = calc_cagr(rev_series)
     result["영업이익_CAGR"] = calc_cagr(op_series)
@@ -475,8 +648,7 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
 
     # ── 이익률 개선 여부 ──
     if len(rev_series) >= 2 and len(op_series) >= 2:
-        latest = sorted(rev_series.keys())[-1]
-        prev = sorted(rev_series.keys())[-2]
+        prev, latest = sorted(rev_series)[-2:]
         opm_l = (op_series.get(latest, 0) / rev_series[latest] * 100) if rev_series[latest] > 0 else np.nan
         opm_p = (op_series.get(prev, 0) / rev_series[prev] * 100) if rev_series[prev] > 0 else np.nan
         result["영업이익률_최근"] = opm_l
@@ -499,7 +671,7 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
 
     # ── [v6] 턴어라운드 감지: 전년 순이익 < 0 → 올해 > 0 ──
     if len(ni_series) >= 2:
-        ni_vals = [ni_series[d] for d in sorted(ni_series.keys())]
+        ni_vals = [v for _, v in sorted(ni_series.items())]
         result["순이익_전년음수"] = 1 if ni_vals[-2] < 0 else 0
         result["순이익_당기양수"] = 1 if ni_vals[-1] > 0 else 0
         result["흑자전환"] = 1 if ni_vals[-2] < 0 and ni_vals[-1] > 0 else 0
@@ -513,19 +685,14 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
 
     # 1) indicators(RATIO_Y)에서 연도별 시계열 추출
     if has_ind:
-        y_data = ind_grp[ind_grp["지표구분"] == "RATIO_Y"]
-        # annual_dates 명시적 정의 (12-31로 끝나는 기준일만)
-        annual_dates = [d for d in sorted(y_data["기준일"].unique()) if str(d).endswith("12-31")]
-        ocf_series = find_account_value(y_data, "영업CF", annual_dates)
-        capex_series = find_account_value(y_data, "CAPEX", annual_dates)
+        ocf_series = lookup_account_value(y_acc, "영업CF", annual_dates)
+        capex_series = lookup_account_value(y_acc, "CAPEX", annual_dates)
 
     # 2) indicators에 없으면 financial_statements(CF)에서 fallback
     if not ocf_series and has_fs:
-        fs_y = fs_grp[(fs_grp["주기"] == "y")]
-        ocf_series = find_account_value(fs_y, "영업CF")
+        ocf_series = lookup_account_value(fs_acc, "영업CF", period="y")
     if not capex_series and has_fs:
-        fs_y = fs_grp[(fs_grp["주기"] == "y")]
-        capex_series = find_account_value(fs_y, "CAPEX")
+        capex_series = lookup_account_value(fs_acc, "CAPEX", period="y")
 
     # CAPEX는 FnGuide에서 음수로 기재되므로 절대값 처리
     capex_series = {d: abs(v) for d, v in capex_series.items()}
@@ -630,10 +797,8 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
     # ── 배당 ──
     dps_series = {}
     if has_ind:
-        dps_data = ind_grp[ind_grp["지표구분"] == "DPS"]
-        annual_dps = [d for d in sorted(dps_data["기준일"].unique()) if str(d).endswith("12-31")]
         if annual_dps:
-            dps_series = find_account_value(dps_data, "배당금", annual_dps)
+            dps_series = lookup_account_value(dps_acc, "배당금", annual_dps)
 
     result["DPS_최근"] = list(dps_series.values())[-1] if dps_series else np.nan
     result["DPS_CAGR"] = calc_cagr(dps_series)
@@ -651,21 +816,103 @@ def analyze_one_stock(ticker, ind_grp, fs_grp):
 
 def analyze_all(fs_df, ind_df):
     results = []
-    tickers = list(set(
-        list(fs_df["종목코드"].unique() if not fs_df.empty else []) +
-        list(ind_df["종목코드"].unique() if not ind_df.empty else [])
-    ))
+    # 정렬된 합집합을 한 번에 (순서가 실행마다 달라지지 않음)
+    tickers = np.union1d(
+        fs_df["종목코드"].dropna().unique() if not fs_df.empty else np.array([], dtype=object),
+        ind_df["종목코드"].dropna().unique() if not ind_df.empty else np.array([], dtype=object),
+    ).tolist()
+    # 종목별 분할을 groupby 한 번으로 (종목마다 전체 프레임을 마스킹하지 않음)
+    ind_groups = dict(iter(ind_df.groupby("종목코드", sort=False))) if not ind_df.empty else {}
+    fs_groups = dict(iter(fs_df.groupby("종목코드", sort=False))) if not fs_df.empty else {}
+    ind_empty = ind_df.iloc[0:0] if not ind_df.empty else pd.DataFrame()
+    fs_empty = fs_df.iloc[0:0] if not fs_df.empty else pd.DataFrame()
+    # 계정 값 조회 테이블도 전체 프레임에서 한 번만 구축
+    ind_index = build_account_index(ind_df, ["종목코드", "지표구분"])
+    fs_index = build_account_index(fs_df, "종목코드")
+    date_index = build_date_index(ind_df)
+    ttm_index = build_quarterly_ttm(ind_df)
+
+    workers = config.ANALYZE_WORKERS or os.cpu_count() or 1
+    if workers > 1 and len(tickers) >= PARALLEL_MIN_TICKERS:
+        # 워커에는 종목별 그룹과 해당 종목의 조회 테이블만 넘겨 피클링 비용을 제한
+        items = [
+            (ticker, ind_groups.get(ticker, ind_empty), fs_groups.get(ticker, fs_empty),
+             {(ticker, g): ind_index[(ticker, g)] for g in IND_GROUPS
+              if (ticker, g) in ind_index},
+             {ticker: fs_index[ticker]} if ticker in fs_index else {},
+             {(ticker, g): date_index[(ticker, g)] for g in IND_GROUPS
+              if (ticker, g) in date_index},
+             {ticker: ttm_index[ticker]} if ticker in ttm_index else {})
+            for ticker in tickers
+        ]
+        chunk = -(-len(items) // (workers * 4))
+        chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+        try:
+            # spawn: 웹 서버(요청·캐시 감시 스레드가 도는 프로세스)에서 fork하면 다른 스레드가 잡고 있던 락·
+            # 리스닝 소켓·시그널 핸들러까지 자식에 복제됨 → 작업 단위는 이미 청크별로 피클링되므로 그대로 동작
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                for part in tqdm(pool.map(_analyze_chunk, chunks), total=len(chunks),
+                                 desc=f"펀더멘털 분석 ({workers} workers)", ncols=100):
+                    results.extend(part)
+            return pd.DataFrame(results)
+        except (OSError, BrokenProcessPool) as e:
+            log.warning(f"프로세스 풀 사용 불가 — 순차 분석으로 전환: {e}")
+            results = []
+
     for ticker in tqdm(tickers, desc="펀더멘털 분석", ncols=100):
-        ind_grp = ind_df[ind_df["종목코드"] == ticker] if not ind_df.empty else pd.DataFrame()
-        fs_grp = fs_df[fs_df["종목코드"] == ticker] if not fs_df.empty else pd.DataFrame()
-        results.append(analyze_one_stock(ticker, ind_grp, fs_grp))
+        ind_grp = ind_groups.get(ticker, ind_empty)
+        fs_grp = fs_groups.get(ticker, fs_empty)
+        results.append(analyze_one_stock(ticker, ind_grp, fs_grp, ind_index, fs_index, date_index,
+                                         ttm_index))
     return pd.DataFrame(results)
 
 
+def _analyze_chunk(items):
+    """프로세스 풀 작업 단위: [(ticker, ind_grp, fs_grp, ind_index, fs_index, date_index, ttm_index), ...] → 결과 리스트"""
+    return [analyze_one_stock(*item) for item in items]
+
+
 # ═════════════════════════════════════════════
 # 밸류에이션 & 스코어링 (v6: 파생지표 추가)
 # ═════════════════════════════════════════════
 
+def _pct_ranks(df, cols, fill=None, clip=None):
+    """여러 컬럼의 백분위 순위(pct)를 DataFrame.rank 한 번으로 계산.
+
+    스크린마다 서브셋이 달라 순위 자체는 서브셋 안에서 구해야 하므로,
+    컬럼별 Series.rank 호출을 스크린당 1회의 블록 연산으로 묶는다.
+    fill: {컬럼: 대체값} — 순위 산정 전 결측 대체 (fillna 한 번)
+    clip: {컬럼: (하한, 상한)} — 결측 대체 후 클리핑
+    원본 df는 변경하지 않으므로 엑셀/DB에는 원래 값(NaN 포함)이 그대로 남는다.
+    """
+    block = df[cols]
+    if fill:
+        block = block.fillna(fill)
+    if clip:
+        block = block.assign(**{c: block[c].clip(lo, hi) for c, (lo, hi) in clip.items()})
+    return block.rank(pct=True)
+
+
+def _weighted_sum(parts):
+    """[(값, 가중치), ...] 가중합. 열들을 (n, k) 행렬로 쌓아 행렬-벡터 곱 한 번으로 계산 (NaN은 전파)"""
+    cols, weights = zip(*parts)
+    return np.column_stack([np.asarray(c, dtype=float) for c in cols]) @ np.asarray(weights, dtype=float)
+
+
+def _ratio(num, den, cond, scale=1):
+    """cond가 참인 행만 num / den (× scale), 나머지는 NaN.
+
+    np.divide(where=)로 유효한 행만 나눠 전체 나눗셈 임시 배열과 np.where 선택 단계를 없앤다.
+    """
+    out = np.full(len(num), np.nan)
+    np.divide(np.asarray(num, dtype=float), np.asarray(den, dtype=float),
+              out=out, where=np.asarray(cond, dtype=bool))
+    if scale != 1:
+        out *= scale
+    return out
+
+
 def calc_valuation(daily, anal_df, multiplier, shares_df):
     merge_cols = ["종목코드", "종목명", "종가", "시가총액", "상장주식수"]
     valid_merge = [c for c in merge_cols if c in daily.columns]
@@ -679,10 +926,10 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
     M = multiplier
 
     # ── 기본 지표 ──
-    df["PER"] = np.where((df["TTM_순이익"] > 0) & (df["시가총액"] > 0), df["시가총액"] / (df["TTM_순이익"] * M), np.nan)
-    df["PBR"] = np.where((df["자본"] > 0) & (df["시가총액"] > 0), df["시가총액"] / (df["자본"] * M), np.nan)
-    df["ROE(%)"] = np.where((df["자본"] > 0) & pd.notna(df["TTM_순이익"]), (df["TTM_순이익"] / df["자본"]) * 100, np.nan)
-    df["부채비율(%)"] = np.where((df["자본"] > 0), (df["부채"] / df["자본"]) * 100, np.nan)
+    df["PER"] = _ratio(df["시가총액"], df["TTM_순이익"] * M, _all_of(df["TTM_순이익"] > 0, df["시가총액"] > 0))
+    df["PBR"] = _ratio(df["시가총액"], df["자본"] * M, _all_of(df["자본"] > 0, df["시가총액"] > 0))
+    df["ROE(%)"] = _ratio(df["TTM_순이익"], df["자본"], _all_of(df["자본"] > 0, df["TTM_순이익"].notna()), 100)
+    df["부채비율(%)"] = _ratio(df["부채"], df["자본"], df["자본"] > 0, 100)
     df["영업이익률(%)"] = df["영업이익률_최근"]
 
     shares_safe = df["상장주식수"].replace(0, np.nan)
@@ -692,41 +939,25 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
 
     # ── [v6] 추가 파생 지표 ──
     # PSR (Price-to-Sales)
-    df["PSR"] = np.where(
-        (df["TTM_매출"] > 0) & (df["시가총액"] > 0),
-        df["시가총액"] / (df["TTM_매출"] * M), np.nan
-    )
+    df["PSR"] = _ratio(df["시가총액"], df["TTM_매출"] * M, _all_of(df["TTM_매출"] > 0, df["시가총액"] > 0))
 
     # PEG (PER / 순이익CAGR) — GARP용
-    df["PEG"] = np.where(
-        pd.notna(df["PER"]) & (df["PER"] > 0) &
-        pd.notna(df["순이익_CAGR"]) & (df["순이익_CAGR"] > 0),
-        df["PER"] / df["순이익_CAGR"], np.nan
-    )
+    df["PEG"] = _ratio(df["PER"], df["순이익_CAGR"], _all_of(df["PER"] > 0, df["순이익_CAGR"] > 0))
 
     # 이익수익률 (Earnings Yield = EPS / 종가)
-    df["이익수익률(%)"] = np.where(
-        (df["종가"] > 0) & pd.notna(df["EPS"]) & (df["EPS"] > 0),
-        (df["EPS"] / df["종가"]) * 100, np.nan
-    )
+    df["이익수익률(%)"] = _ratio(df["EPS"], df["종가"], _all_of(df["종가"] > 0, df["EPS"] > 0), 100)
 
     # FCF 수익률 (진짜 FCF = 영업CF - CAPEX)
-    df["FCF수익률(%)"] = np.where(
-        pd.notna(df["TTM_FCF"]) & (df["시가총액"] > 0),
-        (df["TTM_FCF"] * M / df["시가총액"]) * 100, np.nan
-    )
+    df["FCF수익률(%)"] = _ratio(df["TTM_FCF"] * M, df["시가총액"],
+                               _all_of(df["TTM_FCF"].notna(), df["시가총액"] > 0), 100)
 
     # 현금전환율 (영업CF / 순이익 × 100, 100% 이상이면 이익이 현금으로 뒷받침됨)
-    df["현금전환율(%)"] = np.where(
-        pd.notna(df["TTM_영업CF"]) & pd.notna(df["TTM_순이익"]) & (df["TTM_순이익"] > 0),
-        (df["TTM_영업CF"] / df["TTM_순이익"]) * 100, np.nan
-    )
+    df["현금전환율(%)"] = _ratio(df["TTM_영업CF"], df["TTM_순이익"],
+                              _all_of(df["TTM_영업CF"].notna(), df["TTM_순이익"] > 0), 100)
 
     # CAPEX 비율 (CAPEX / 영업CF × 100, 낮을수록 경자산 비즈니스)
-    df["CAPEX비율(%)"] = np.where(
-        pd.notna(df["TTM_CAPEX"]) & pd.notna(df["TTM_영업CF"]) & (df["TTM_영업CF"] > 0),
-        (df["TTM_CAPEX"] / df["TTM_영업CF"]) * 100, np.nan
-    )
+    df["CAPEX비율(%)"] = _ratio(df["TTM_CAPEX"], df["TTM_영업CF"],
+                               _all_of(df["TTM_CAPEX"].notna(), df["TTM_영업CF"] > 0), 100)
 
     # 영업CF > 순이익 (이익 품질 플래그)
     df["이익품질_양호"] = np.where(
@@ -735,21 +966,20 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
     )
 
     # 부채상환능력 (영업CF / 부채총계, 높을수록 부채 상환 여력 큼)
-    df["부채상환능력"] = np.where(
-        pd.notna(df["TTM_영업CF"]) & pd.notna(df["부채"]) & (df["부채"] > 0),
-        (df["TTM_영업CF"] / df["부채"]), np.nan
-    )
+    df["부채상환능력"] = _ratio(df["TTM_영업CF"], df["부채"], _all_of(df["TTM_영업CF"].notna(), df["부채"] > 0))
 
     # F7: 주식 희석 없음 (발행주식수 미증가) — shares 데이터 활용
     if not shares_df.empty and "발행주식수" in shares_df.columns and "기준일" in shares_df.columns:
-        for idx, row in df.iterrows():
-            code = row["종목코드"]
-            s = shares_df[shares_df["종목코드"] == code].sort_values("기준일")
-            if len(s) >= 2:
-                latest_shares = s["발행주식수"].iloc[-1]
-                prev_shares = s["발행주식수"].iloc[-2]
-                if pd.notna(latest_shares) and pd.notna(prev_shares) and prev_shares > 0:
-                    df.at[idx, "F7_희석없음"] = 1 if latest_shares <= prev_shares else 0
+        # 종목별 최근/직전 발행주식수를 정렬 + shift 한 번으로 (종목마다 shares_df 재필터링 없음)
+        s = shares_df[["종목코드", "기준일", "발행주식수"]].sort_values(["종목코드", "기준일"], kind="stable")
+        s["직전"] = s.groupby("종목코드", sort=False)["발행주식수"].shift(1)
+        last = s.drop_duplicates("종목코드", keep="last").set_index("종목코드")
+        ok = last["발행주식수"].notna() & last["직전"].notna() & (last["직전"] > 0)
+        f7 = (last.loc[ok, "발행주식수"] <= last.loc[ok, "직전"]).astype(int)
+        hit = df["종목코드"].map(f7)
+        has = hit.notna()
+        if has.any():
+            df.loc[has, "F7_희석없음"] = hit[has].astype(int)
         # F스코어 재계산 (F7 반영)
         if "F7_희석없음" in df.columns:
             df["F스코어"] = (
@@ -770,16 +1000,23 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
     df["괴리율(%)"] = ((df["적정주가_SRIM"] - df["종가"]) / df["종가"]) * 100
 
     # 검증 플래그
-    df["PER_이상"] = np.where((df["PER"] < 0.5) | (df["PER"] > 500), "⚠️", "")
+    # 표시용 플래그 — 스크리닝은 문자열 비교 대신 PER 범위 조건으로 직접 걸러냄
+    per = df["PER"].to_numpy()
+    df["PER_이상"] = np.where((per < 0.5) | (per > 500), "⚠️", "")
 
     # ── 스코어링 (NaN은 순위에서 제외 → NaN 유지, 스크리닝 단계에서 필터) ──
-    df["S_PER"] = (1 - df["PER"].rank(pct=True, na_option='keep')) * 100
-    df["S_PBR"] = (1 - df["PBR"].rank(pct=True, na_option='keep')) * 100
-    df["S_ROE"] = df["ROE(%)"].rank(pct=True, na_option='keep') * 100
-
-    df["S_매출CAGR"] = df["매출_CAGR"].rank(pct=True, na_option='keep') * 100
-    df["S_영업이익CAGR"] = df["영업이익_CAGR"].rank(pct=True, na_option='keep') * 100
-    df["S_순이익CAGR"] = df["순이익_CAGR"].rank(pct=True, na_option='keep') * 100
+    r = _pct_ranks(df, [
+        "PER", "PBR", "ROE(%)", "매출_CAGR", "영업이익_CAGR", "순이익_CAGR",
+        "이익률_변동폭", "배당수익률(%)", "괴리율(%)", "F스코어", "FCF수익률(%)",
+        "Q_매출_YoY(%)", "Q_영업이익_YoY(%)", "TTM_매출_YoY(%)", "TTM_영업이익_YoY(%)",
+    ])
+    df["S_PER"] = (1 - r["PER"]) * 100
+    df["S_PBR"] = (1 - r["PBR"]) * 100
+    df["S_ROE"] = r["ROE(%)"] * 100
+
+    df["S_매출CAGR"] = r["매출_CAGR"] * 100
+    df["S_영업이익CAGR"] = r["영업이익_CAGR"] * 100
+    df["S_순이익CAGR"] = r["순이익_CAGR"] * 100
 
     # 연속성장: 각 항목 0~5년을 0~100으로 정규화 후 평균
     df["S_연속성장"] = (
@@ -789,38 +1026,38 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
     ) / 3
 
     # 이익률 변동폭 연속값 사용 (이진 플래그 대신 실제 개선폭 반영)
-    df["S_이익률개선"] = df["이익률_변동폭"].rank(pct=True, na_option='keep') * 100
-    df["S_배당수익률"] = df["배당수익률(%)"].rank(pct=True, na_option='keep') * 100
+    df["S_이익률개선"] = r["이익률_변동폭"] * 100
+    df["S_배당수익률"] = r["배당수익률(%)"] * 100
     df["S_배당연속증가"] = df["배당_연속증가"].fillna(0).clip(0, 5) / 5 * 100
-    df["S_괴리율"] = df["괴리율(%)"].rank(pct=True, na_option='keep') * 100
-    df["S_F스코어"] = df["F스코어"].rank(pct=True, na_option='keep') * 100
-    df["S_FCF수익률"] = df["FCF수익률(%)"].rank(pct=True, na_option='keep') * 100
+    df["S_괴리율"] = r["괴리율(%)"] * 100
+    df["S_F스코어"] = r["F스코어"] * 100
+    df["S_FCF수익률"] = r["FCF수익률(%)"] * 100
 
     # 계절성 통제 스코어 (분기 YoY 기반)
-    df["S_Q매출YoY"] = df["Q_매출_YoY(%)"].rank(pct=True, na_option='keep') * 100
-    df["S_Q영업이익YoY"] = df["Q_영업이익_YoY(%)"].rank(pct=True, na_option='keep') * 100
-    df["S_TTM매출YoY"] = df["TTM_매출_YoY(%)"].rank(pct=True, na_option='keep') * 100
-    df["S_TTM영업이익YoY"] = df["TTM_영업이익_YoY(%)"].rank(pct=True, na_option='keep') * 100
+    df["S_Q매출YoY"] = r["Q_매출_YoY(%)"] * 100
+    df["S_Q영업이익YoY"] = r["Q_영업이익_YoY(%)"] * 100
+    df["S_TTM매출YoY"] = r["TTM_매출_YoY(%)"] * 100
+    df["S_TTM영업이익YoY"] = r["TTM_영업이익_YoY(%)"] * 100
     df["S_Q연속YoY"] = (
         df["Q_매출_연속YoY성장"].fillna(0).clip(0, 4) / 4 * 100 +
         df["Q_영업이익_연속YoY성장"].fillna(0).clip(0, 4) / 4 * 100
     ) / 2
 
-    df["종합점수"] = (
-        df["S_PER"].fillna(0) * 1.5 +
-        df["S_PBR"].fillna(0) * 1.0 +
-        df["S_ROE"].fillna(0) * 2.0 +
-        df["S_매출CAGR"].fillna(0) * 2.0 +
-        df["S_영업이익CAGR"].fillna(0) * 2.0 +
-        df["S_순이익CAGR"].fillna(0) * 1.0 +
-        df["S_연속성장"].fillna(0) * 1.0 +
-        df["S_이익률개선"].fillna(0) * 1.0 +
-        df["S_배당수익률"].fillna(0) * 0.3 +
-        df["S_배당연속증가"].fillna(0) * 0.3 +
-        df["S_괴리율"].fillna(0) * 1.0 +
-        df["S_F스코어"].fillna(0) * 2.0 +
-        df["S_FCF수익률"].fillna(0) * 1.5
-    )
+    df["종합점수"] = _weighted_sum([
+        (df["S_PER"].fillna(0), 1.5),
+        (df["S_PBR"].fillna(0), 1.0),
+        (df["S_ROE"].fillna(0), 2.0),
+        (df["S_매출CAGR"].fillna(0), 2.0),
+        (df["S_영업이익CAGR"].fillna(0), 2.0),
+        (df["S_순이익CAGR"].fillna(0), 1.0),
+        (df["S_연속성장"].fillna(0), 1.0),
+        (df["S_이익률개선"].fillna(0), 1.0),
+        (df["S_배당수익률"].fillna(0), 0.3),
+        (df["S_배당연속증가"].fillna(0), 0.3),
+        (df["S_괴리율"].fillna(0), 1.0),
+        (df["S_F스코어"].fillna(0), 2.0),
+        (df["S_FCF수익률"].fillna(0), 1.5),
+    ])
 
     return df
 
@@ -829,6 +1066,47 @@ def calc_valuation(daily, anal_df, multiplier, shares_df):
 # [v7] 기술적 지표 (주가 히스토리 기반)
 # ═════════════════════════════════════════════
 
+def _tail_matrix(frame, col, index):
+    """종목별로 날짜 정렬된 long 프레임을 최신값이 마지막 열에 오는 우측 정렬 2D 행렬로 변환.
+
+    Returns:
+        (행렬 [len(index) × 최대 길이], 종목별 값 개수) — 빈 칸은 NaN
+    """
+    row = index.get_indexer(frame["종목코드"])
+    pos = frame.groupby("종목코드").cumcount().to_numpy()
+    counts = np.bincount(row, minlength=len(index))
+    width = max(int(counts.max()) if len(counts) else 0, 1)
+    mat = np.full((len(index), width), np.nan)
+    mat[row, width - counts[row] + pos] = frame[col].to_numpy(dtype=float)
+    return mat, counts
+
+
+def _close_matrix_indicators(closes):
+    """우측 정렬 종가 행렬에서 MA20/MA60/RSI14/60일 변동성을 한 번에 계산.
+
+    모든 지표가 최근 N개 열에 대한 행 방향 축약이므로 종목 수와 무관하게
+    NumPy 연산 몇 번으로 끝난다. 히스토리가 부족한 행은 호출부에서 마스킹.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ma20 = closes[:, -20:].mean(axis=1)
+        ma60 = closes[:, -60:].mean(axis=1)
+
+        # 최근 61개 종가의 차분을 한 번만 구해 RSI(마지막 14개)와 변동성(60개)이 공유
+        window = closes[:, -61:]
+        diffs = np.diff(window, axis=1)
+
+        delta = diffs[:, -14:]
+        avg_gain = np.where(delta > 0, delta, 0.0).mean(axis=1) if delta.size else np.full(len(closes), np.nan)
+        avg_loss = np.where(delta < 0, -delta, 0.0).mean(axis=1) if delta.size else np.full(len(closes), np.nan)
+        rsi = np.select([avg_loss > 0, avg_gain > 0], [100 - (100 / (1 + avg_gain / avg_loss)), 100.0], 50.0)
+
+        vol_60 = np.full(len(closes), np.nan)
+        if diffs.shape[1] >= 60:
+            returns = diffs / window[:, :-1]
+            vol_60 = returns.std(axis=1, ddof=1) * np.sqrt(252) * 100
+    return {"ma20": ma20, "ma60": ma60, "rsi": rsi, "vol_60": vol_60}
+
+
 def calc_technical_indicators(df: pd.DataFrame, price_hist: pd.DataFrame) -> pd.DataFrame:
     """주가 히스토리로 기술적 지표를 계산하여 df에 병합.
 
@@ -849,92 +1127,63 @@ def calc_technical_indicators(df: pd.DataFrame, price_hist: pd.DataFrame) -> pd.
             df[col] = np.nan
         return df
 
-    tech_results = []
-    for code in df["종목코드"].unique():
-        ph = price_hist[price_hist["종목코드"] == code].copy()
-        if ph.empty or len(ph) < 5:
-            tech_results.append({"종목코드": code})
-            continue
-
-        ph = ph.sort_values("날짜")
-        closes = ph["종가"].dropna()
-
-        if len(closes) < 5:
-            tech_results.append({"종목코드": code})
-            continue
-
-        latest_close = closes.iloc[-1]
-        result = {"종목코드": code}
-
-        # 52주 최고/최저 대비
-        high_52w = ph["고가"].max() if "고가" in ph.columns else closes.max()
-        low_52w = ph["저가"].min() if "저가" in ph.columns else closes.min()
-        if pd.notna(high_52w) and high_52w > 0:
-            result["52주_최고대비(%)"] = (latest_close - high_52w) / high_52w * 100
-        if pd.notna(low_52w) and low_52w > 0:
-            result["52주_최저대비(%)"] = (latest_close - low_52w) / low_52w * 100
+    # 종목별 루프 대신 (종목코드, 날짜) 정렬 후 종목 × 거래일 행렬로 전 종목을 한 번에 계산
+    codes = pd.Index(df["종목코드"].unique(), name="종목코드")
+    ph = price_hist[price_hist["종목코드"].isin(codes)].sort_values(["종목코드", "날짜"], kind="stable")
+
+    closes = ph.loc[ph["종가"].notna(), ["종목코드", "종가"]]
+    close_mat, n_close = _tail_matrix(closes, "종가", codes)
+    n_rows = ph.groupby("종목코드").size().reindex(codes, fill_value=0).to_numpy()
+    valid = (n_rows >= 5) & (n_close >= 5)
+    latest_close = close_mat[:, -1]
+    k = _close_matrix_indicators(close_mat)
+
+    tech = pd.DataFrame(index=codes)
+
+    # 52주 최고/최저 대비 — 최근 252거래일 창에 대한 행 방향 축약 (fmax/fmin은 NaN 무시)
+    high_col = "고가" if "고가" in ph.columns else "종가"
+    low_col = "저가" if "저가" in ph.columns else "종가"
+    high_mat, _ = _tail_matrix(ph, high_col, codes)
+    low_mat, _ = _tail_matrix(ph, low_col, codes)
+    high_52w = np.fmax.reduce(high_mat[:, -252:], axis=1)
+    low_52w = np.fmin.reduce(low_mat[:, -252:], axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tech["52주_최고대비(%)"] = np.where(high_52w > 0, (latest_close - high_52w) / high_52w * 100, np.nan)
+        tech["52주_최저대비(%)"] = np.where(low_52w > 0, (latest_close - low_52w) / low_52w * 100, np.nan)
 
         # 이동평균 이격도
-        if len(closes) >= 20:
-            ma20 = closes.iloc[-20:].mean()
-            if ma20 > 0:
-                result["MA20_이격도(%)"] = (latest_close / ma20 - 1) * 100
-        if len(closes) >= 60:
-            ma60 = closes.iloc[-60:].mean()
-            if ma60 > 0:
-                result["MA60_이격도(%)"] = (latest_close / ma60 - 1) * 100
-
-        # RSI 14일
-        if len(closes) >= 15:
-            delta = closes.diff()
-            gain = delta.where(delta > 0, 0.0)
-            loss = (-delta.where(delta < 0, 0.0))
-            avg_gain = gain.iloc[-14:].mean()
-            avg_loss = loss.iloc[-14:].mean()
-            if avg_loss > 0:
-                rs = avg_gain / avg_loss
-                result["RSI_14"] = 100 - (100 / (1 + rs))
-            elif avg_gain > 0:
-                result["RSI_14"] = 100.0
-            else:
-                result["RSI_14"] = 50.0
-
-        # 거래대금 분석
-        volumes = ph["거래량"].dropna() if "거래량" in ph.columns else pd.Series(dtype=float)
-        amounts = ph["거래대금"].dropna() if "거래대금" in ph.columns else pd.Series(dtype=float)
-
-        # 거래대금이 없으면 종가 × 거래량으로 추정
-        if amounts.empty and not volumes.empty:
-            amounts = (ph["종가"] * ph["거래량"]).dropna()
-
-        if len(amounts) >= 20:
-            avg_20d = amounts.iloc[-20:].mean()
-            result["거래대금_20일평균"] = avg_20d
-            if avg_20d > 0 and len(amounts) >= 5:
-                avg_5d = amounts.iloc[-5:].mean()
-                result["거래대금_증감(%)"] = (avg_5d / avg_20d - 1) * 100
-
-        # 변동성 (60일, 연환산)
-        if len(closes) >= 60:
-            returns = closes.pct_change().dropna()
-            if len(returns) >= 60:
-                vol_60 = returns.iloc[-60:].std() * np.sqrt(252) * 100
-                result["변동성_60일(%)"] = vol_60
-
-        tech_results.append(result)
-
-    tech_df = pd.DataFrame(tech_results)
-    if tech_df.empty:
+        tech["MA20_이격도(%)"] = np.where((n_close >= 20) & (k["ma20"] > 0), (latest_close / k["ma20"] - 1) * 100, np.nan)
+        tech["MA60_이격도(%)"] = np.where((n_close >= 60) & (k["ma60"] > 0), (latest_close / k["ma60"] - 1) * 100, np.nan)
+
+    # RSI 14일
+    tech["RSI_14"] = np.where(n_close >= 15, k["rsi"], np.nan)
+
+    # 거래대금 분석 (거래대금이 없는 종목은 종가 × 거래량으로 추정)
+    amt = ph["거래대금"] if "거래대금" in ph.columns else pd.Series(np.nan, index=ph.index)
+    if "거래량" in ph.columns:
+        has_amt = amt.notna().groupby(ph["종목코드"]).transform("any")
+        amt = amt.where(has_amt, ph["종가"] * ph["거래량"])
+    amounts = ph.loc[amt.notna(), ["종목코드"]].assign(amt=amt[amt.notna()])
+    amt_mat, n_amt = _tail_matrix(amounts, "amt", codes)
+    avg_20d = amt_mat[:, -20:].mean(axis=1)
+    avg_5d = amt_mat[:, -5:].mean(axis=1)
+    tech["거래대금_20일평균"] = np.where(n_amt >= 20, avg_20d, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tech["거래대금_증감(%)"] = np.where((n_amt >= 20) & (avg_20d > 0), (avg_5d / avg_20d - 1) * 100, np.nan)
+
+    # 변동성 (60일, 연환산)
+    tech["변동성_60일(%)"] = np.where(n_close >= 61, k["vol_60"], np.nan)
+
+    # 히스토리가 5거래일 미만인 종목은 지표 없음
+    tech.loc[~valid] = np.nan
+    if tech.empty:
         return df
 
-    # 병합
-    tech_cols = [c for c in tech_df.columns if c != "종목코드"]
-    for col in tech_cols:
-        if col in df.columns:
-            df = df.drop(columns=[col])
-
-    df = df.merge(tech_df, on="종목코드", how="left")
-    log.info("기술적 지표 계산 완료 (%d종목)", len(tech_df))
+    # 병합 — tech는 종목코드 인덱스이므로 drop + merge 없이 정렬 후 컬럼 직접 할당
+    aligned = tech.reindex(df["종목코드"].to_numpy())
+    for col in tech.columns:
+        df[col] = aligned[col].to_numpy()
+    log.info("기술적 지표 계산 완료 (%d종목)", len(tech))
     return df
 
 
@@ -942,49 +1191,66 @@ def calc_technical_indicators(df: pd.DataFrame, price_hist: pd.DataFrame) -> pd.
 # 스크리닝 (기존 2 + 신규 3 = 총 5개 필터)
 # ═════════════════════════════════════════════
 
+def _all_of(*conds):
+    """스크리닝 조건들을 (k, n) bool 배열로 쌓아 np.logical_and.reduce 한 번으로 결합.
+
+    체인 & 마다 생기는 중간 bool Series를 만들지 않는다.
+    NaN과의 비교는 항상 False이므로 별도의 notna 조건은 필요 없다.
+    """
+    return np.logical_and.reduce([np.asarray(c, dtype=bool) for c in conds])
+
+
 def apply_screen(df):
     """① 기본 우량주/저평가 스크리닝"""
-    mask = (
-        pd.notna(df["TTM_순이익"]) & (df["TTM_순이익"] > 0) &
-        (df["ROE(%)"] >= 5) &
-        (df["PER"].between(1, 50)) &
-        (df["PBR"].between(0.1, 10)) &
-        (df["매출_연속성장"] >= 2) &
-        (df["순이익_연속성장"] >= 1) &
-        (df["시가총액"] >= 50_000_000_000) &
-        (df["PER_이상"] == "") &
-        (df["F스코어"] >= 5)
+    mask = _all_of(
+        df["TTM_순이익"] > 0,
+        df["ROE(%)"] >= 5,
+        df["PER"].between(1, 50),  # PER_이상(0.5 미만·500 초과) 제외 포함
+        df["PBR"].between(0.1, 10),
+        df["매출_연속성장"] >= 2,
+        df["순이익_연속성장"] >= 1,
+        df["시가총액"] >= 50_000_000_000,
+        df["F스코어"] >= 5,
     )
     return df[mask].sort_values("종합점수", ascending=False)
 
 
 def apply_momentum_screen(df):
     """② 모멘텀/성장주 스크리닝 (계절성 통제 강화)"""
-    mask = (
-        pd.notna(df["매출_CAGR"]) &
-        pd.notna(df["영업이익_CAGR"]) &
-        ((df["매출_CAGR"] >= 15) | (df["영업이익_CAGR"] >= 15)) &
-        (df["이익률_개선"] == 1) &
-        (df["ROE(%)"] >= 5) &
-        (df["TTM_순이익"] > 0) &
-        (df["시가총액"] >= 50_000_000_000)
+    mask = _all_of(
+        df["매출_CAGR"].notna(),
+        df["영업이익_CAGR"].notna(),
+        (df["매출_CAGR"] >= 15) | (df["영업이익_CAGR"] >= 15),
+        df["이익률_개선"] == 1,
+        df["ROE(%)"] >= 5,
+        df["TTM_순이익"] > 0,
+        df["시가총액"] >= 50_000_000_000,
     )
     mom_df = df[mask].copy()
     if not mom_df.empty:
-        mom_df["모멘텀_점수"] = (
-            mom_df["매출_CAGR"].rank(pct=True) * 2.0 +
-            mom_df["영업이익_CAGR"].rank(pct=True) * 2.5 +
-            mom_df["ROE(%)"].rank(pct=True) * 1.5 +
-            mom_df["영업이익률_최근"].rank(pct=True) * 1.0 +
-            mom_df["이익률_개선"].rank(pct=True) * 0.5 +
-            # 계절성 통제 지표 (분기 YoY)
-            mom_df["Q_매출_YoY(%)"].fillna(0).rank(pct=True) * 2.0 +
-            mom_df["Q_영업이익_YoY(%)"].fillna(0).rank(pct=True) * 2.0 +
-            mom_df["Q_매출_연속YoY성장"].fillna(0).clip(0, 4).rank(pct=True) * 1.5 +
-            mom_df["RSI_14"].fillna(50).rank(pct=True) * 1.0 +
-            mom_df["MA20_이격도(%)"].fillna(0).rank(pct=True) * 1.0 +
-            mom_df["거래대금_증감(%)"].fillna(0).rank(pct=True) * 0.5
+        r = _pct_ranks(
+            mom_df,
+            ["매출_CAGR", "영업이익_CAGR", "ROE(%)", "영업이익률_최근", "이익률_개선",
+             "Q_매출_YoY(%)", "Q_영업이익_YoY(%)", "Q_매출_연속YoY성장",
+             "RSI_14", "MA20_이격도(%)", "거래대금_증감(%)"],
+            fill={"Q_매출_YoY(%)": 0, "Q_영업이익_YoY(%)": 0, "Q_매출_연속YoY성장": 0,
+                  "RSI_14": 50, "MA20_이격도(%)": 0, "거래대금_증감(%)": 0},
+            clip={"Q_매출_연속YoY성장": (0, 4)},
         )
+        mom_df["모멘텀_점수"] = _weighted_sum([
+            (r["매출_CAGR"], 2.0),
+            (r["영업이익_CAGR"], 2.5),
+            (r["ROE(%)"], 1.5),
+            (r["영업이익률_최근"], 1.0),
+            (r["이익률_개선"], 0.5),
+            # 계절성 통제 지표 (분기 YoY)
+            (r["Q_매출_YoY(%)"], 2.0),
+            (r["Q_영업이익_YoY(%)"], 2.0),
+            (r["Q_매출_연속YoY성장"], 1.5),
+            (r["RSI_14"], 1.0),
+            (r["MA20_이격도(%)"], 1.0),
+            (r["거래대금_증감(%)"], 0.5),
+        ])
     if "모멘텀_점수" in mom_df.columns:
         return mom_df.sort_values("모멘텀_점수", ascending=False)
     return mom_df
@@ -1000,29 +1266,33 @@ def apply_garp_screen(df):
       - PER 5~30 (적자·극단 제외)
       - 시총 500억+ (소형주 제외)
     """
-    mask = (
-        pd.notna(df["PEG"]) & (df["PEG"] > 0) & (df["PEG"] < 1.5) &
-        pd.notna(df["매출_CAGR"]) & (df["매출_CAGR"] >= 10) &
-        pd.notna(df["ROE(%)"]) & (df["ROE(%)"] >= 12) &
-        pd.notna(df["PER"]) & df["PER"].between(5, 30) &
-        (df["시가총액"] >= 50_000_000_000) &
-        (df["TTM_순이익"] > 0) &
-        (df["PER_이상"] == "")
+    mask = _all_of(
+        df["PEG"] > 0,
+        df["PEG"] < 1.5,
+        df["매출_CAGR"] >= 10,
+        df["ROE(%)"] >= 12,
+        df["PER"].between(5, 30),  # PER_이상(0.5 미만·500 초과) 제외 포함
+        df["시가총액"] >= 50_000_000_000,
+        df["TTM_순이익"] > 0,
     )
     g = df[mask].copy()
     if not g.empty:
-        g["GARP_점수"] = (
-            (1 - g["PEG"].rank(pct=True)) * 3.0 +           # 낮은 PEG 선호
-            g["매출_CAGR"].rank(pct=True) * 2.0 +            # 높은 매출 성장
-            g["영업이익_CAGR"].rank(pct=True) * 1.5 +        # 높은 이익 성장
-            g["ROE(%)"].rank(pct=True) * 2.0 +               # 높은 ROE
-            (1 - g["PER"].rank(pct=True)) * 1.5 +            # 낮은 PER
-            (1 - g["PBR"].clip(0.5, 10).rank(pct=True)) * 1.0 +  # 낮은 PBR
-            g["현금전환율(%)"].fillna(100).clip(50, 200).rank(pct=True) * 1.0 +  # 현금 이익 품질
-            g["F스코어"].fillna(0).rank(pct=True) * 0.5 +    # 재무건전성
-            g["이익률_개선"].fillna(0) * 0.5 +               # 이익률 개선 보너스
-            g["S_괴리율"].fillna(0) / 100 * 0.5              # S-RIM 저평가
-        )
+        r = _pct_ranks(g, ["PEG", "매출_CAGR", "영업이익_CAGR", "ROE(%)", "PER", "PBR",
+                           "현금전환율(%)", "F스코어"],
+                       fill={"현금전환율(%)": 100, "F스코어": 0},
+                       clip={"PBR": (0.5, 10), "현금전환율(%)": (50, 200)})
+        g["GARP_점수"] = _weighted_sum([
+            (1 - r["PEG"], 3.0),                # 낮은 PEG 선호
+            (r["매출_CAGR"], 2.0),                # 높은 매출 성장
+            (r["영업이익_CAGR"], 1.5),              # 높은 이익 성장
+            (r["ROE(%)"], 2.0),                 # 높은 ROE
+            (1 - r["PER"], 1.5),                # 낮은 PER
+            (1 - r["PBR"], 1.0),                # 낮은 PBR
+            (r["현금전환율(%)"], 1.0),               # 현금 이익 품질
+            (r["F스코어"], 0.5),                   # 재무건전성
+            (g["이익률_개선"].fillna(0), 0.5),       # 이익률 개선 보너스
+            (g["S_괴리율"].fillna(0) / 100, 0.5),  # S-RIM 저평가
+        ])
     if "GARP_점수" in g.columns:
         return g.sort_values("GARP_점수", ascending=False)
     return g
@@ -1041,33 +1311,34 @@ def apply_cashcow_screen(df):
       - 이익품질 양호 (영업CF > 순이익)
       - F스코어 ≥ 6 (재무 건전성)
     """
-    mask = (
-        pd.notna(df["ROE(%)"]) & (df["ROE(%)"] >= 10) &
-        pd.notna(df["영업이익률(%)"]) & (df["영업이익률(%)"] >= 10) &
-        (
-            (pd.notna(df["부채비율(%)"]) & (df["부채비율(%)"] < 100)) |
-            df["부채비율(%)"].isna()
-        ) &
-        (df["매출_연속성장"] >= 1) &
-        (df["시가총액"] >= 50_000_000_000) &
-        (df["TTM_순이익"] > 0) &
-        (df["이익품질_양호"] == 1) &
-        (df["F스코어"] >= 6)
+    mask = _all_of(
+        df["ROE(%)"] >= 10,
+        df["영업이익률(%)"] >= 10,
+        ~(df["부채비율(%)"] >= 100),        # 부채비율 < 100 또는 결측(무차입)
+        df["매출_연속성장"] >= 1,
+        df["시가총액"] >= 50_000_000_000,
+        df["TTM_순이익"] > 0,
+        df["이익품질_양호"] == 1,
+        df["F스코어"] >= 6,
     )
     c = df[mask].copy()
     if not c.empty:
-        c["캐시카우_점수"] = (
-            c["ROE(%)"].rank(pct=True) * 2.0 +                               # ROE
-            c["영업이익률(%)"].rank(pct=True) * 2.0 +                         # 영업이익률
-            (1 - c["부채비율(%)"].fillna(0).rank(pct=True)) * 1.5 +          # 저부채 선호
-            c["FCF수익률(%)"].fillna(0).rank(pct=True) * 2.5 +               # FCF 수익률 (핵심)
-            c["부채상환능력"].fillna(0).clip(0, 3).rank(pct=True) * 2.0 +    # 부채상환 여력
-            c["매출_연속성장"].fillna(0).rank(pct=True) * 1.0 +              # 안정 성장
-            (1 - c["PER"].clip(1, 100).rank(pct=True)) * 1.0 +              # 저PER
-            c["배당수익률(%)"].rank(pct=True) * 0.5 +                         # 배당 보너스
-            c["F스코어"].rank(pct=True) * 1.0 +                              # 재무건전성
-            c["S_괴리율"].fillna(0) / 100 * 0.5                              # S-RIM 저평가
-        )
+        r = _pct_ranks(c, ["ROE(%)", "영업이익률(%)", "부채비율(%)", "FCF수익률(%)", "부채상환능력",
+                           "매출_연속성장", "PER", "배당수익률(%)", "F스코어"],
+                       fill={"부채비율(%)": 0, "FCF수익률(%)": 0, "부채상환능력": 0, "매출_연속성장": 0},
+                       clip={"부채상환능력": (0, 3), "PER": (1, 100)})
+        c["캐시카우_점수"] = _weighted_sum([
+            (r["ROE(%)"], 2.0),                 # ROE
+            (r["영업이익률(%)"], 2.0),               # 영업이익률
+            (1 - r["부채비율(%)"], 1.5),            # 저부채 선호
+            (r["FCF수익률(%)"], 2.5),              # FCF 수익률 (핵심)
+            (r["부채상환능력"], 2.0),                 # 부채상환 여력
+            (r["매출_연속성장"], 1.0),                # 안정 성장
+            (1 - r["PER"], 1.0),                # 저PER
+            (r["배당수익률(%)"], 0.5),               # 배당 보너스
+            (r["F스코어"], 1.0),                   # 재무건전성
+            (c["S_괴리율"].fillna(0) / 100, 0.5),  # S-RIM 저평가
+        ])
     if "캐시카우_점수" in c.columns:
         return c.sort_values("캐시카우_점수", ascending=False)
     return c
@@ -1083,28 +1354,28 @@ def apply_turnaround_screen(df):
       - 현재 순이익 > 0 (현재 흑자)
       - 시총 300억+ (소형주 포함 — 턴어라운드는 초기 발굴)
     """
-    mask = (
-        (
-            (df["흑자전환"] == 1) |
-            (df["이익률_급개선"] == 1)
-        ) &
-        (df["TTM_순이익"] > 0) &
-        (df["시가총액"] >= 30_000_000_000)
+    mask = _all_of(
+        (df["흑자전환"] == 1) | (df["이익률_급개선"] == 1),
+        df["TTM_순이익"] > 0,
+        df["시가총액"] >= 30_000_000_000,
     )
     t = df[mask].copy()
     if not t.empty:
-        t["턴어라운드_점수"] = (
-            t["이익률_변동폭"].fillna(0).rank(pct=True) * 2.0 +       # 이익률 개선폭
-            t["매출_CAGR"].rank(pct=True) * 2.0 +                     # 매출 성장 (더 중요)
-            t["ROE(%)"].rank(pct=True) * 1.5 +                        # ROE
-            t["흑자전환"].fillna(0) * 2.0 +                           # 흑전 보너스
-            (1 - t["PER"].clip(0, 100).rank(pct=True)) * 1.0 +       # 저PER
-            t["이익률_급개선"].fillna(0) * 1.5 +                      # 급개선 보너스
-            (1 - t["RSI_14"].fillna(50).rank(pct=True)) * 1.0 +      # 과매도 선호
-            (1 - t["52주_최고대비(%)"].fillna(0).abs().rank(pct=True)) * 1.0 +  # 저점 매수 기회
-            t["F스코어"].fillna(0).rank(pct=True) * 0.5 +             # 최소 재무건전성
-            t["S_괴리율"].fillna(0) / 100 * 0.5                      # S-RIM 저평가
-        )
+        r = _pct_ranks(t, ["이익률_변동폭", "매출_CAGR", "ROE(%)", "PER", "RSI_14", "F스코어"],
+                       fill={"이익률_변동폭": 0, "RSI_14": 50, "F스코어": 0},
+                       clip={"PER": (0, 100)})
+        t["턴어라운드_점수"] = _weighted_sum([
+            (r["이익률_변동폭"], 2.0),                                         # 이익률 개선폭
+            (r["매출_CAGR"], 2.0),                                         # 매출 성장 (더 중요)
+            (r["ROE(%)"], 1.5),                                          # ROE
+            (t["흑자전환"].fillna(0), 2.0),                                  # 흑전 보너스
+            (1 - r["PER"], 1.0),                                         # 저PER
+            (t["이익률_급개선"].fillna(0), 1.5),                               # 급개선 보너스
+            (1 - r["RSI_14"], 1.0),                                      # 과매도 선호
+            (1 - t["52주_최고대비(%)"].fillna(0).abs().rank(pct=True), 1.0),  # 저점 매수 기회
+            (r["F스코어"], 0.5),                                            # 최소 재무건전성
+            (t["S_괴리율"].fillna(0) / 100, 0.5),                           # S-RIM 저평가
+        ])
     if "턴어라운드_점수" in t.columns:
         return t.sort_values("턴어라운드_점수", ascending=False)
     return t
@@ -1123,29 +1394,33 @@ def apply_dividend_growth_screen(df):
       - 현재 흑자
       - 수익 + 배당 동반증가 확인 (배당_수익동반증가 == 1)
     """
-    mask = (
-        (df["순이익_연속성장"] >= 2) &
-        (df["배당_연속증가"] >= 1) &
-        pd.notna(df["DPS_CAGR"]) & (df["DPS_CAGR"] > 0) &
-        pd.notna(df["ROE(%)"]) & (df["ROE(%)"] >= 5) &
-        (df["배당수익률(%)"] > 0) &
-        (df["시가총액"] >= 30_000_000_000) &
-        (df["TTM_순이익"] > 0) &
-        (df["배당_수익동반증가"] == 1)
+    mask = _all_of(
+        df["순이익_연속성장"] >= 2,
+        df["배당_연속증가"] >= 1,
+        df["DPS_CAGR"] > 0,
+        df["ROE(%)"] >= 5,
+        df["배당수익률(%)"] > 0,
+        df["시가총액"] >= 30_000_000_000,
+        df["TTM_순이익"] > 0,
+        df["배당_수익동반증가"] == 1,
     )
     d = df[mask].copy()
     if not d.empty:
-        d["배당성장_점수"] = (
-            d["DPS_CAGR"].rank(pct=True) * 3.0 +                    # 배당 성장률 (핵심)
-            d["순이익_CAGR"].rank(pct=True) * 2.5 +                   # 수익 성장률
-            d["배당_연속증가"].fillna(0).rank(pct=True) * 2.0 +        # 연속 배당 증가
-            d["순이익_연속성장"].fillna(0).rank(pct=True) * 2.0 +      # 연속 수익 증가
-            d["ROE(%)"].rank(pct=True) * 1.5 +                        # 자본 수익성
-            d["배당수익률(%)"].rank(pct=True) * 1.5 +                  # 배당 수익률
-            (1 - d["부채비율(%)"].fillna(0).rank(pct=True)) * 1.0 +   # 저부채 선호
-            d["F스코어"].fillna(0).rank(pct=True) * 0.5 +             # 재무건전성
-            (1 - d["PER"].clip(1, 100).rank(pct=True)) * 0.5         # 저PER
-        )
+        r = _pct_ranks(d, ["DPS_CAGR", "순이익_CAGR", "배당_연속증가", "순이익_연속성장", "ROE(%)",
+                           "배당수익률(%)", "부채비율(%)", "F스코어", "PER"],
+                       fill={"배당_연속증가": 0, "순이익_연속성장": 0, "부채비율(%)": 0, "F스코어": 0},
+                       clip={"PER": (1, 100)})
+        d["배당성장_점수"] = _weighted_sum([
+            (r["DPS_CAGR"], 3.0),     # 배당 성장률 (핵심)
+            (r["순이익_CAGR"], 2.5),     # 수익 성장률
+            (r["배당_연속증가"], 2.0),      # 연속 배당 증가
+            (r["순이익_연속성장"], 2.0),     # 연속 수익 증가
+            (r["ROE(%)"], 1.5),       # 자본 수익성
+            (r["배당수익률(%)"], 1.5),     # 배당 수익률
+            (1 - r["부채비율(%)"], 1.0),  # 저부채 선호
+            (r["F스코어"], 0.5),         # 재무건전성
+            (1 - r["PER"], 0.5),      # 저PER
+        ])
     if "배당성장_점수" in d.columns:
         return d.sort_values("배당성장_점수", ascending=False)
     return d
@@ -1157,12 +1432,13 @@ def apply_dividend_growth_screen(df):
 
 def save_to_excel(df, filepath, sheet_name="Result"):
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
     from openpyxl.utils import get_column_letter
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = sheet_name
+    # write-only 모드: 행을 append 하는 즉시 디스크로 흘려보내 시트 전체를 메모리에 들고 있지 않음
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
 
     col_groups = {
         "기본정보": ["종목코드", "종목명", "종가", "시가총액", "상장주식수"],
@@ -1192,7 +1468,7 @@ def save_to_excel(df, filepath, sheet_name="Result"):
         if c not in ordered_cols and not c.startswith("S_"):
             ordered_cols.append(c)
 
-    export_df = df[ordered_cols].copy()
+    export_df = df[ordered_cols]
 
     fills = {
         "기본정보": PatternFill("solid", fgColor="D6E4F0"),
@@ -1208,41 +1484,74 @@ def save_to_excel(df, filepath, sheet_name="Result"):
     data_font = Font(name="맑은 고딕", size=9)
     thin_border = Border(bottom=Side(style='thin', color='CCCCCC'))
 
-    for col_idx, col_name in enumerate(ordered_cols, 1):
-        cell = ws.cell(row=1, column=col_idx, value=col_name)
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
-        for grp, cols in col_groups.items():
-            if col_name in cols:
-                cell.fill = fills[grp]
-                break
-
-    for row_idx, (_, row_data) in enumerate(export_df.iterrows(), 2):
-        for col_idx, col_name in enumerate(ordered_cols, 1):
-            val = row_data[col_name]
-            if pd.isna(val): val = None
-            elif isinstance(val, (np.floating, float)): val = round(float(val), 2)
-            elif isinstance(val, (np.integer,)): val = int(val)
-
-            cell = ws.cell(row=row_idx, column=col_idx, value=val)
-            cell.font = data_font
-            cell.border = thin_border
-
-            if col_name in ["시가총액", "종가", "EPS", "BPS", "적정주가_SRIM"]:
-                cell.number_format = '#,##0'
-            elif "%" in col_name or "CAGR" in col_name:
-                cell.number_format = '#,##0.00'
-            elif "점수" in col_name:
-                cell.number_format = '#,##0.0'
+    # 컬럼 → 헤더 색 / 숫자 서식 매핑을 한 번만 만들어 셀 루프에서는 dict 조회만
+    col_to_fill = {c: fills[grp] for grp, cols in col_groups.items()
+                   if grp in fills for c in cols}
+    money_cols = {"시가총액", "종가", "EPS", "BPS", "적정주가_SRIM"}
+
+    def _number_format(col_name):
+        if col_name in money_cols:
+            return '#,##0'
+        if "%" in col_name or "CAGR" in col_name:
+            return '#,##0.00'
+        if "점수" in col_name:
+            return '#,##0.0'
+        return None
 
+    col_to_fmt = {c: _number_format(c) for c in ordered_cols}
+
+    # 데이터 셀 서식은 숫자 서식별 NamedStyle 하나로 묶어 셀마다 폰트/테두리 객체를 등록하지 않음
+    col_to_style = {}
+    for col_name, fmt in col_to_fmt.items():
+        name = f"data {fmt or 'General'}"
+        if name not in wb.named_styles:
+            wb.add_named_style(NamedStyle(name=name, font=data_font, border=thin_border,
+                                          number_format=fmt or 'General'))
+        col_to_style[col_name] = name
+
+    def _cell_values(ser):
+        """컬럼 단위 셀 값 변환: NaN → None, 실수는 소수 둘째 자리 반올림"""
+        if pd.api.types.is_float_dtype(ser.dtype):
+            return [None if v != v else round(v, 2) for v in ser.tolist()]
+        out = []
+        for v in ser.tolist():
+            if pd.isna(v): v = None
+            elif isinstance(v, (np.floating, float)): v = round(float(v), 2)
+            elif isinstance(v, np.integer): v = int(v)
+            out.append(v)
+        return out
+
+    # write-only 시트는 열 너비·틀 고정·필터를 행 기록 전에 지정해야 함
     for col_idx, col_name in enumerate(ordered_cols, 1):
         width = 12
         if col_name == "종목명": width = 18
         elif "점수" in col_name: width = 14
         ws.column_dimensions[get_column_letter(col_idx)].width = width
 
-    ws.auto_filter.ref = ws.dimensions
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(ordered_cols))}{len(export_df) + 1}"
     ws.freeze_panes = "C2"
+
+    header = []
+    for col_name in ordered_cols:
+        cell = WriteOnlyCell(ws, value=col_name)
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        fill = col_to_fill.get(col_name)
+        if fill is not None:
+            cell.fill = fill
+        header.append(cell)
+    ws.append(header)
+
+    columns = [_cell_values(export_df[c]) for c in ordered_cols]
+    styles = [col_to_style[c] for c in ordered_cols]
+    for values in zip(*columns):
+        row = []
+        for val, style in zip(values, styles):
+            cell = WriteOnlyCell(ws, value=val)
+            cell.style = style
+            row.append(cell)
+        ws.append(row)
+
     wb.save(filepath)
     log.info(f"💾 저장: {filepath}")
 
@@ -1254,8 +1563,8 @@ def save_to_excel(df, filepath, sheet_name="Result"):
 def run():
     master = load_table("master")
     daily = load_table("daily")
-    fs = load_table("financial_statements")
-    ind = load_table("indicators")
+    fs = load_table("financial_statements", columns=FS_COLUMNS)
+    ind = load_table("indicators", filters={"지표구분": IND_GROUPS})
     shares = load_table("shares")
 
     if daily.empty:
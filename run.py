@@ -24,12 +24,13 @@ logger = logging.getLogger(__name__)
 
 
 def cmd_server(args):
-    from webapp.app import app
+    from webapp.app import app, start_cache_watcher
     import config
 
     import db as _db
     _db.init_db()
 
+    start_cache_watcher()
     app.run(host=config.HOST, port=config.PORT, debug=config.DEBUG)
 
 
@@ -4,16 +4,28 @@ Reads dashboard_result from SQLite DB produced by the pipeline and serves it
 with server-side filtering, sorting, and pagination.
 """
 
+import gzip
+import hashlib
 import json
 import logging
 import os
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 
 import numpy as np
 import pandas as pd
 from flask import Flask, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:  # 선택 의존성 — 없으면 Flask 기본 JSON 직렬화 사용
+    orjson = None
+
 import config
 import db as _db
 from analysis.claude_analyzer import generate_report
@@ -27,12 +39,84 @@ app = Flask(
 )
 CORS(app)
 
+
+if orjson is not None:
+    class _OrjsonProvider(DefaultJSONProvider):
+        """jsonify 직렬화를 orjson(C 구현)으로 — NaN → null, numpy 스칼라·배열 직접 직렬화.
+
+        날짜·Decimal 등은 기존 Flask 형식 그대로 default로 넘긴다.
+        """
+
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+        def dumps(self, obj, **kwargs) -> str:
+            return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            option = self.options
+            if (self.compact is None and self._app.debug) or self.compact is False:
+                option |= orjson.OPT_INDENT_2
+            return self._app.response_class(
+                orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype
+            )
+
+    app.json = _OrjsonProvider(app)
+
+
 # ── In-memory data cache ──
-_cache: dict = {"df": pd.DataFrame(), "mtime": 0}
-_prev_cache: dict = {"df": pd.DataFrame(), "mtime": 0}
+def _empty_cache() -> dict:
+    """대시보드 캐시 항목 (빈 상태).
+
+    재로드 시 dict를 통째로 새로 만들어 교체 → 요청은 같은 시점의 df·masks·search·orders를 함께 봄.
+    """
+    return {"df": pd.DataFrame(), "mtime": 0, "fingerprint": None, "masks": {}, "markets": {},
+            "display": pd.DataFrame(), "summary": [], "search": None, "codes": {},
+            "orders": OrderedDict(), "pages": OrderedDict()}
+
+
+_cache: dict = _empty_cache()
+_prev_cache: dict = {"df": pd.DataFrame(), "mtime": 0, "fingerprint": None, "masks": {}, "codes": {}}
+# 재로드는 한 스레드만 (파이프라인 직후 동시 요청이 각자 DB를 다시 읽지 않도록)
+_cache_lock = threading.Lock()
+
+# /api/stocks LRU (캐시 항목별, 데이터 재로드 시 새로 시작)
+#   orders: 필터·정렬 결과 행 위치 — 키: 필터/정렬 파라미터
+#   pages:  직렬화된 응답 본문 {"raw", "gzip"} — 키: 필터/정렬 파라미터 + page/size
+ORDER_CACHE_SIZE = 64
+PAGE_CACHE_SIZE = 128
+_orders_lock = threading.Lock()
+
+# DB 파일 변경 감시 주기 (초) — 파이프라인 직후 첫 요청 대신 백그라운드 스레드가 캐시를 재로드
+CACHE_WATCH_INTERVAL = config.CACHE_WATCH_INTERVAL
 
 # ── Pipeline state ──
 _pipeline: dict = {"running": False, "started_at": None, "finished_at": None, "error": None}
+# 파이프라인 전용 단일 워커 — 요청마다 스레드를 만들지 않고, 확인·제출을 락으로 묶어 중복 실행 방지
+_pipeline_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline")
+_pipeline_lock = threading.Lock()
+
+# 검색 인덱스에서 종목명과 종목코드를 잇는 구분자 (검색어에 나올 수 없는 문자)
+# NUL("\x00")은 pandas 3 기본 str dtype에서 이어 붙일 때 사라져 이름 끝·코드 앞에 걸친 검색어가 매칭됨
+SEARCH_SEP = "\x01"
+
+# 카테고리로 보관할 저카디널리티 문자열 컬럼
+CATEGORY_COLS = ("시장구분", "종목구분", "PER_이상")
+MARKETS = ("KOSPI", "KOSDAQ")
+
+# min_*/max_* 범위 필터 비교 연산
+RANGE_OPS = {"min_": np.greater_equal, "max_": np.less_equal}
+
+# JSON 응답 gzip 압축 (이보다 작은 본문은 그대로)
+COMPRESS_MIN_SIZE = 2048
+COMPRESS_LEVEL = 6
+
+# 동시 보고서 생성(Claude API 호출) 수 제한 — 초과 요청은 429, 조회 요청용 스레드를 남겨 둠
+MAX_CONCURRENT_REPORTS = 2
+_report_sem = threading.BoundedSemaphore(MAX_CONCURRENT_REPORTS)
+
+# Screening tabs (see _screen_mask)
+SCREENS = ("screened", "momentum", "garp", "cashcow", "turnaround", "dividend_growth")
 
 # Columns exposed to the frontend
 DISPLAY_COLS = [
@@ -60,62 +144,220 @@ DISPLAY_COLS = [
 ]
 
 
-def _load_data() -> pd.DataFrame:
-    """Load (or reload) dashboard data from DB into cache."""
+def _db_mtime() -> float:
     db_path = str(config.DB_PATH)
-    if not os.path.exists(db_path):
-        _cache["df"] = pd.DataFrame()
-        _cache["mtime"] = 0
-        return _cache["df"]
+    return os.path.getmtime(db_path) if os.path.exists(db_path) else 0
+
+
+def _current_cache() -> dict:
+    """Current dashboard cache entry, reloaded from DB if the file changed."""
+    global _cache
+    mtime = _db_mtime()
+    cache = _cache
+    if mtime == cache["mtime"]:
+        return cache
+
+    with _cache_lock:
+        cache = _cache
+        if mtime == cache["mtime"]:  # 락 대기 중 다른 스레드가 이미 재로드
+            return cache
+        if not mtime:
+            cache = _empty_cache()
+        else:
+            # DB 파일은 보고서 저장 등으로도 바뀜 → 테이블 지문이 같으면 재로드 생략
+            fingerprint = _db.table_fingerprint("dashboard_result")
+            if fingerprint is not None and fingerprint == cache["fingerprint"]:
+                cache = {**cache, "mtime": mtime}
+            else:
+                df = _prepare_frame(_db.load_dashboard())
+                cache = {"df": df, "mtime": mtime, "fingerprint": fingerprint, "display": _display_frame(df),
+                         "masks": _screen_masks(df), "markets": _market_masks(df),
+                         "summary": _market_summary(df), "search": _search_index(df),
+                         "codes": _code_index(df), "orders": OrderedDict(), "pages": OrderedDict()}
+                log.info("Loaded %d rows from DB (dashboard_result)", len(df))
+        _cache = cache
+    return cache
+
+
+def _current_prev_cache() -> dict:
+    """Previous batch cache entry (dashboard_result_prev), reloaded if the file changed."""
+    global _prev_cache
+    mtime = _db_mtime()
+    cache = _prev_cache
+    if mtime == cache["mtime"]:
+        return cache
+
+    with _cache_lock:
+        cache = _prev_cache
+        if mtime == cache["mtime"]:
+            return cache
+        if not mtime:
+            cache = {"df": pd.DataFrame(), "mtime": 0, "fingerprint": None, "masks": {}, "codes": {}}
+        else:
+            fingerprint = _db.table_fingerprint("dashboard_result_prev")
+            if fingerprint is not None and fingerprint == cache["fingerprint"]:
+                cache = {**cache, "mtime": mtime}
+            else:
+                df = _prepare_frame(_db.load_dashboard_prev())
+                cache = {"df": df, "mtime": mtime, "fingerprint": fingerprint, "masks": _screen_masks(df),
+                         "codes": _code_index(df)}
+        _prev_cache = cache
+    return cache
 
-    mtime = os.path.getmtime(db_path)
-    if mtime != _cache["mtime"]:
-        df = _db.load_dashboard()
-        if not df.empty:
-            if "종목코드" in df.columns:
-                df["종목코드"] = df["종목코드"].astype(str).str.zfill(6)
-            df = df.replace({np.nan: None})
-        _cache["df"] = df
-        _cache["mtime"] = mtime
-        log.info("Loaded %d rows from DB (dashboard_result)", len(df))
 
-    return _cache["df"]
+def _load_data() -> pd.DataFrame:
+    """Load (or reload) dashboard data from DB into cache."""
+    return _current_cache()["df"]
 
 
 def _load_prev_data() -> pd.DataFrame:
     """Load previous batch dashboard data (dashboard_result_prev) into cache."""
-    db_path = str(config.DB_PATH)
-    if not os.path.exists(db_path):
-        _prev_cache["df"] = pd.DataFrame()
-        _prev_cache["mtime"] = 0
-        return _prev_cache["df"]
-
-    mtime = os.path.getmtime(db_path)
-    if mtime != _prev_cache["mtime"]:
-        df = _db.load_dashboard_prev()
-        if not df.empty:
-            if "종목코드" in df.columns:
-                df["종목코드"] = df["종목코드"].astype(str).str.zfill(6)
-            df = df.replace({np.nan: None})
-        _prev_cache["df"] = df
-        _prev_cache["mtime"] = mtime
-
-    return _prev_cache["df"]
-
-
-def _safe_val(v):
-    """Convert numpy types to JSON-safe Python types."""
-    if v is None:
-        return None
-    if isinstance(v, (np.integer,)):
-        return int(v)
-    if isinstance(v, (np.floating,)):
-        return round(float(v), 4) if not np.isnan(v) else None
-    return v
+    return _current_prev_cache()["df"]
+
+
+def _watch_db() -> None:
+    """DB 파일 mtime을 주기적으로 확인해 바뀌었으면 캐시를 미리 재로드 (요청 경로와 같은 락·교체 방식).
+
+    배치가 DB에 쓰는 동안에는 열지 않도록 mtime이 한 주기 동안 그대로일 때만 재로드한다
+    (DuckDB 파일은 한 프로세스만 열 수 있어 별도 프로세스의 배치와 경합).
+    """
+    seen = None
+    while True:
+        time.sleep(CACHE_WATCH_INTERVAL)
+        mtime = _db_mtime()
+        if mtime == _cache["mtime"] == _prev_cache["mtime"] or mtime != seen:
+            seen = mtime
+            continue
+        try:
+            _current_cache()
+            _current_prev_cache()
+        except Exception as e:  # DB 잠김 등 — 다음 주기 또는 요청 시 다시 시도
+            log.warning("Background cache reload failed: %s", e)
+
 
+_watcher_started = False
+_watcher_lock = threading.Lock()
+
+
+def start_cache_watcher() -> None:
+    """캐시 감시 스레드 시작 — 서버 프로세스에서만 호출 (gunicorn post_worker_init, run.py server).
+
+    debug 리로더의 감시용 부모 프로세스에서는 띄우지 않고, 여러 번 호출해도 스레드는 하나.
+    """
+    global _watcher_started
+    if CACHE_WATCH_INTERVAL <= 0:
+        return
+    if config.DEBUG and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return
+    with _watcher_lock:
+        if _watcher_started:
+            return
+        _watcher_started = True
+    threading.Thread(target=_watch_db, name="cache-watcher", daemon=True).start()
+
+
+def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """캐시용 dtype 정리.
+
+    NaN → None 치환은 모든 컬럼을 object로 바꿔 메모리와 필터 비용을 키우므로 하지 않는다
+    (NaN은 직렬화 시 None으로 변환). 값 종류가 몇 개뿐인 문자열 컬럼은 category로 두어
+    비교가 코드 배열 비교가 되게 한다.
+    """
+    if df.empty:
+        return df
+    if "종목코드" in df.columns:
+        df["종목코드"] = df["종목코드"].astype(str).str.zfill(6)
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
 
-def _row_to_dict(row, cols):
-    return {c: _safe_val(row.get(c)) for c in cols if c in row.index}
+
+def _display_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """DISPLAY_COLS만 모은 좁은 프레임 (연속 블록으로 복사) — 목록·비교 응답은 이 프레임에서 행을 뽑는다."""
+    return df[[c for c in DISPLAY_COLS if c in df.columns]].copy()
+
+
+def _code_index(df: pd.DataFrame) -> dict:
+    """종목코드 → 행 위치 (중복 시 첫 행) — 상세·보고서 조회가 매번 전체 컬럼을 비교하지 않도록."""
+    if df.empty or "종목코드" not in df.columns:
+        return {}
+    codes = df["종목코드"].tolist()
+    return dict(zip(reversed(codes), range(len(codes) - 1, -1, -1)))
+
+
+def _search_index(df: pd.DataFrame) -> pd.Series | None:
+    """소문자 종목명 + SEARCH_SEP + 소문자 종목코드 Series — 이름·코드를 문자열 스캔 한 번으로 검색."""
+    if df.empty or "종목명" not in df.columns:
+        return None
+    return (
+        df["종목명"].fillna("").astype(str).str.lower()
+        + SEARCH_SEP
+        + df["종목코드"].fillna("").astype(str).str.lower()
+    )
+
+
+def _records(df: pd.DataFrame, cols: list) -> list[dict]:
+    """DataFrame → JSON-safe dict 리스트. 행마다 iterrows + 셀 단위 변환 대신
+    object 변환 + NaN→None + to_dict(records) 한 번으로 처리 (값은 Python 기본 타입)."""
+    sub = df[cols]
+    return sub.astype(object).where(sub.notna(), None).to_dict(orient="records")
+
+
+def _rows(df: pd.DataFrame, cols: list) -> list[list]:
+    """_records와 같은 변환, 행을 dict 대신 cols 순서의 값 리스트로."""
+    sub = df[cols]
+    return sub.astype(object).where(sub.notna(), None).to_numpy().tolist()
+
+
+def _etagged(view):
+    """대시보드 데이터 버전 + 요청 URL로 약한 ETag를 붙이고, If-None-Match가 같으면
+    뷰를 실행하지 않고 304로 응답 (탭을 열어 둔 채 재조회할 때 필터·직렬화 생략)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = _current_cache()
+        version = cache["fingerprint"] or cache["mtime"]
+        etag = hashlib.md5(f"{version}|{request.full_path}".encode()).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            resp = app.response_class(status=304)
+        else:
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+        resp.set_etag(etag, weak=True)
+        resp.cache_control.no_cache = True  # 매번 재검증 (본문은 304로 생략)
+        resp.vary.add("Accept-Encoding")  # 304도 200과 같은 Vary (gzip 본문이 다른 인코딩으로 재사용되지 않도록)
+        return resp
+    return wrapper
+
+
+@app.after_request
+def _compress_json(resp):
+    """클라이언트가 gzip을 받으면 큰 JSON 응답을 압축 (목록 페이지는 수십~수백 KB)."""
+    if resp.mimetype != "application/json":
+        return resp
+    resp.vary.add("Accept-Encoding")
+    if (resp.status_code != 200 or resp.direct_passthrough or "Content-Encoding" in resp.headers
+            or not request.accept_encodings["gzip"]):
+        return resp
+    body = resp.get_data()
+    if len(body) >= COMPRESS_MIN_SIZE:
+        resp.set_data(gzip.compress(body, compresslevel=COMPRESS_LEVEL))
+        resp.headers["Content-Encoding"] = "gzip"
+    return resp
+
+
+def _cached_body_response(entry: dict):
+    """페이지 LRU 항목의 응답 — gzip 본문은 항목당 한 번만 압축해 두고 재사용 (_compress_json은 건너뜀)."""
+    raw = entry["raw"]
+    if len(raw) < COMPRESS_MIN_SIZE or not request.accept_encodings["gzip"]:
+        return app.response_class(raw, mimetype="application/json")
+    body = entry.get("gzip")
+    if body is None:
+        body = entry["gzip"] = gzip.compress(raw, compresslevel=COMPRESS_LEVEL)
+    resp = app.response_class(body, mimetype="application/json")
+    resp.headers["Content-Encoding"] = "gzip"
+    return resp
 
 
 # ─────────────────────────────────────────
@@ -131,7 +373,87 @@ def dashboard():
 # REST API
 # ─────────────────────────────────────────
 
+def _ordered_positions(cache: dict, screen: str, codes_param: str, market: str, q: str,
+                       ranges: tuple, sort_col: str, order: str) -> np.ndarray:
+    """Row positions of df passing the /api/stocks filters, in display order.
+
+    전체 프레임을 복사/재필터링하지 않고 bool 마스크만 누적한다.
+    """
+    df = cache["df"]
+    mask = np.ones(len(df), dtype=bool)
+
+    # ── Screening filter (reload 시 미리 계산한 마스크) ──
+    masks = cache["masks"]
+    if screen in masks:
+        mask &= masks[screen]
+
+    # ── Codes filter (watchlist 지원) ──
+    if codes_param:
+        codes = [c.strip().zfill(6) for c in codes_param.split(",") if c.strip()]
+        if codes:
+            mask &= df["종목코드"].isin(codes).to_numpy()
+
+    # ── Market filter ──
+    if market and "시장구분" in df.columns:
+        market_mask = cache["markets"].get(market.upper())
+        if market_mask is None:
+            market_mask = (df["시장구분"] == market.upper()).to_numpy(dtype=bool)
+        mask &= market_mask
+
+    # ── Text search ──
+    if q and cache["search"] is not None:
+        q_lc = q.lower()
+        if SEARCH_SEP in q_lc:  # 구분자를 포함한 검색어는 이름·코드 어느 쪽에도 없음
+            mask[:] = False
+        else:
+            mask &= cache["search"].str.contains(q_lc, regex=False).to_numpy(dtype=bool)
+
+    # ── Column range filters ──
+    # 숫자 컬럼은 Series 연산 없이 NumPy 배열에서 바로 비교해 mask에 누적 (NaN → False)
+    for key, val in ranges:
+        op = RANGE_OPS.get(key[:4])
+        col = key[4:]  # Remove "min_"/"max_" prefix
+        if op is None or col not in df.columns:
+            continue
+        try:
+            bound = float(val)
+            values = df[col]
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+                mask &= op(values.to_numpy(), bound)
+            else:
+                mask &= op(values, bound).to_numpy(dtype=bool)
+        except (ValueError, TypeError):
+            pass
+
+    pos = np.flatnonzero(mask)
+
+    # ── Sort (정렬 키 컬럼만 정렬) ──
+    if sort_col in df.columns:
+        asc = order != "desc"
+        values = df[sort_col]
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biuf":
+            pos = pos[_argsort_nan_last(values.to_numpy()[pos], asc)]
+        else:
+            keys = values.iloc[pos].reset_index(drop=True)
+            pos = pos[keys.sort_values(ascending=asc, na_position="last").index.to_numpy()]
+
+    return pos
+
+
+def _argsort_nan_last(values: np.ndarray, ascending: bool) -> np.ndarray:
+    """숫자 배열 argsort (NaN은 맨 뒤). Series.sort_values와 동순위 순서까지 같고 Series/Index 생성은 없음."""
+    nan = np.isnan(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+    idx = np.flatnonzero(~nan)
+    keys = values[idx]
+    if ascending:
+        ordered = idx[keys.argsort()]
+    else:
+        ordered = idx[::-1][keys[::-1].argsort()][::-1]
+    return np.concatenate([ordered, np.flatnonzero(nan)])
+
+
 @app.route("/api/stocks")
+@_etagged
 def api_stocks():
     """Paginated stock list with filtering, sorting, and screening tab support.
 
@@ -145,12 +467,19 @@ def api_stocks():
         size    – page size (max 200)
         min_*   – minimum value for column (e.g., min_PER=10)
         max_*   – maximum value for column (e.g., max_PER=20)
+        format  – "columns": items 대신 columns(컬럼명 목록) + data(행 값 배열)로 응답
     """
-    df = _load_data()
+    cache = _current_cache()
+    df = cache["df"]
+    columnar = request.args.get("format") == "columns"
     if df.empty:
-        return jsonify({"total": 0, "page": 1, "size": 50, "items": []})
+        rows = {"columns": [], "data": []} if columnar else {"items": []}
+        return jsonify({"total": 0, "page": 1, "size": 50, **rows})
 
     screen = request.args.get("screen", "all")
+    if screen in SCREENS and screen not in cache["masks"]:
+        # 필요한 컬럼이 없어 마스크를 만들지 못한 탭 — 전체 목록으로 대체하지 않음
+        return jsonify({"error": f"'{screen}' 스크리닝에 필요한 컬럼이 없습니다."}), 500
     market = request.args.get("market", "")
     q = request.args.get("q", "").strip()
     sort_col = request.args.get("sort", "종합점수")
@@ -158,108 +487,76 @@ def api_stocks():
     page = max(int(request.args.get("page", 1)), 1)
     size = min(int(request.args.get("size", 50)), 200)
 
-    filtered = df.copy()
-
-    # ── Screening filter ──
-    if screen == "screened":
-        filtered = _apply_screen_filter(filtered, "screened")
-    elif screen == "momentum":
-        filtered = _apply_screen_filter(filtered, "momentum")
-    elif screen == "garp":
-        filtered = _apply_screen_filter(filtered, "garp")
-    elif screen == "cashcow":
-        filtered = _apply_screen_filter(filtered, "cashcow")
-    elif screen == "turnaround":
-        filtered = _apply_screen_filter(filtered, "turnaround")
-    elif screen == "dividend_growth":
-        filtered = _apply_screen_filter(filtered, "dividend_growth")
-
-    # ── Codes filter (watchlist 지원) ──
+    # 같은 조건으로 페이지만 넘길 때는 필터·정렬을 다시 하지 않고,
+    # 같은 페이지를 다시 요청하면 직렬화된 본문을 그대로 반환 (데이터 재로드 시 캐시 비움)
     codes_param = request.args.get("codes", "")
-    if codes_param:
-        codes = [c.strip().zfill(6) for c in codes_param.split(",") if c.strip()]
-        if codes:
-            filtered = filtered[filtered["종목코드"].isin(codes)]
+    ranges = tuple(sorted((k, v) for k, v in request.args.items() if k.startswith(("min_", "max_"))))
+    key = (screen, codes_param, market, q, ranges, sort_col, order)
+    page_key = key + (page, size, columnar)
+    entry = _lru_get(cache["pages"], page_key)
+    if entry is not None:
+        return _cached_body_response(entry)
+
+    pos = _lru_get(cache["orders"], key)
+    if pos is None:
+        pos = _ordered_positions(cache, screen, codes_param, market, q, ranges, sort_col, order)
+        _lru_put(cache["orders"], key, pos, ORDER_CACHE_SIZE)
+    total = len(pos)
 
-    # ── Market filter ──
-    if market and "시장구분" in filtered.columns:
-        filtered = filtered[filtered["시장구분"] == market.upper()]
+    # ── Paginate ──
+    start = (page - 1) * size
+    display = cache["display"]
+    page_df = display.iloc[pos[start : start + size]]
+    cols = list(display.columns)
+    if columnar:
+        # 행마다 컬럼명을 반복하지 않는 컬럼형 응답 (대시보드 목록이 사용)
+        payload = {"total": total, "page": page, "size": size, "columns": cols, "data": _rows(page_df, cols)}
+    else:
+        payload = {"total": total, "page": page, "size": size, "items": _records(page_df, cols)}
 
-    # ── Text search ──
-    if q:
-        mask = (
-            filtered["종목명"].str.contains(q, case=False, na=False)
-            | filtered["종목코드"].str.contains(q, case=False, na=False)
-        )
-        filtered = filtered[mask]
+    entry = {"raw": jsonify(payload).get_data(), "gzip": None}
+    _lru_put(cache["pages"], page_key, entry, PAGE_CACHE_SIZE)
+    return _cached_body_response(entry)
 
-    # ── Column range filters ──
-    for key, val in request.args.items():
-        if key.startswith("min_"):
-            col = key[4:]  # Remove "min_" prefix
-            if col in filtered.columns:
-                try:
-                    filtered = filtered[filtered[col] >= float(val)]
-                except (ValueError, TypeError):
-                    pass
-        elif key.startswith("max_"):
-            col = key[4:]  # Remove "max_" prefix
-            if col in filtered.columns:
-                try:
-                    filtered = filtered[filtered[col] <= float(val)]
-                except (ValueError, TypeError):
-                    pass
-
-    total = len(filtered)
-
-    # ── Sort ──
-    if sort_col in filtered.columns:
-        asc = order != "desc"
-        filtered = filtered.sort_values(sort_col, ascending=asc, na_position="last")
 
-    # ── Paginate ──
-    start = (page - 1) * size
-    page_df = filtered.iloc[start : start + size]
+def _lru_get(lru: OrderedDict, key):
+    with _orders_lock:
+        value = lru.get(key)
+        if value is not None:
+            lru.move_to_end(key)
+    return value
 
-    available = [c for c in DISPLAY_COLS if c in page_df.columns]
-    items = [_row_to_dict(row, available) for _, row in page_df.iterrows()]
 
-    return jsonify({"total": total, "page": page, "size": size, "items": items})
+def _lru_put(lru: OrderedDict, key, value, limit: int):
+    with _orders_lock:
+        lru[key] = value
+        lru.move_to_end(key)
+        while len(lru) > limit:
+            lru.popitem(last=False)
 
 
 @app.route("/api/stocks/<code>")
+@_etagged
 def api_stock_detail(code: str):
     """Detail view for a single stock."""
-    df = _load_data()
+    cache = _current_cache()
+    df = cache["df"]
     if df.empty:
         return jsonify({"error": "No data"}), 404
 
-    row = df[df["종목코드"] == code.zfill(6)]
-    if row.empty:
+    pos = cache["codes"].get(code.zfill(6))
+    if pos is None:
         return jsonify({"error": "Stock not found"}), 404
 
-    data = {c: _safe_val(row.iloc[0].get(c)) for c in df.columns}
+    data = _records(df.iloc[pos : pos + 1], list(df.columns))[0]
     return jsonify(data)
 
 
 @app.route("/api/markets/summary")
+@_etagged
 def api_market_summary():
-    """Aggregate stats per market."""
-    df = _load_data()
-    if df.empty or "시장구분" not in df.columns:
-        return jsonify([])
-
-    results = []
-    for mkt in ("KOSPI", "KOSDAQ"):
-        sub = df[df["시장구분"] == mkt]
-        results.append({
-            "market": mkt,
-            "stock_count": len(sub),
-            "avg_per": _safe_val(sub["PER"].median()) if "PER" in sub.columns else None,
-            "avg_pbr": _safe_val(sub["PBR"].median()) if "PBR" in sub.columns else None,
-            "avg_roe": _safe_val(sub["ROE(%)"].median()) if "ROE(%)" in sub.columns else None,
-        })
-    return jsonify(results)
+    """Aggregate stats per market (computed once per reload, see _market_summary)."""
+    return jsonify(_current_cache()["summary"])
 
 
 def _run_pipeline_tracked(**opts):
@@ -282,16 +579,17 @@ def _run_pipeline_tracked(**opts):
 @app.route("/api/batch/trigger", methods=["POST"])
 def api_batch_trigger():
     """Manually trigger the pipeline in background."""
-    if _pipeline["running"]:
-        return jsonify({"status": "already_running", "message": "파이프라인이 이미 실행 중입니다"}), 409
-
     opts = {}
     if request.is_json:
         opts["skip_collect"] = request.json.get("skip_collect", False)
         opts["test_mode"] = request.json.get("test_mode", False)
 
-    thread = threading.Thread(target=_run_pipeline_tracked, kwargs=opts, daemon=True)
-    thread.start()
+    with _pipeline_lock:
+        if _pipeline["running"]:
+            return jsonify({"status": "already_running", "message": "파이프라인이 이미 실행 중입니다"}), 409
+        # 워커가 시작되기 전에 표시해 두어야 직후 요청도 409를 받음
+        _pipeline["running"] = True
+        _pipeline_executor.submit(_run_pipeline_tracked, **opts)
     return jsonify({"status": "triggered", "message": "파이프라인이 시작되었습니다. 완료까지 수분 소요됩니다."})
 
 
@@ -309,39 +607,36 @@ def api_batch_status():
 @app.route("/api/batch/changes")
 def api_batch_changes():
     """이전 배치 대비 종목 변동(편입/제거)을 전략별로 반환."""
-    curr_df = _load_data()
-    prev_df = _load_prev_data()
+    curr, prev = _current_cache(), _current_prev_cache()
+    curr_df, prev_df = curr["df"], prev["df"]
 
     if curr_df.empty or prev_df.empty:
         return jsonify({"has_changes": False, "strategies": {}})
 
-    screens = ["all", "screened", "momentum", "garp", "cashcow", "turnaround", "dividend_growth"]
     result = {}
 
-    for screen in screens:
+    for screen in ("all",) + SCREENS:
         if screen == "all":
             curr_codes = set(curr_df["종목코드"])
             prev_codes = set(prev_df["종목코드"])
+        elif screen not in curr["masks"] or screen not in prev["masks"]:
+            continue  # 한쪽 스냅샷에 스크리닝 컬럼이 없음 — 비교 불가
         else:
-            curr_filtered = _apply_screen_filter(curr_df.copy(), screen)
-            prev_filtered = _apply_screen_filter(prev_df.copy(), screen)
-            curr_codes = set(curr_filtered["종목코드"])
-            prev_codes = set(prev_filtered["종목코드"])
+            curr_codes = set(curr_df.loc[curr["masks"][screen], "종목코드"])
+            prev_codes = set(prev_df.loc[prev["masks"][screen], "종목코드"])
 
         added = curr_codes - prev_codes
         removed = prev_codes - curr_codes
 
         added_list = []
         for code in sorted(added):
-            row = curr_df[curr_df["종목코드"] == code]
-            name = row.iloc[0]["종목명"] if not row.empty else code
-            added_list.append({"code": code, "name": name})
+            name = curr_df["종목명"].iat[curr["codes"][code]]
+            added_list.append({"code": code, "name": None if pd.isna(name) else name})
 
         removed_list = []
         for code in sorted(removed):
-            row = prev_df[prev_df["종목코드"] == code]
-            name = row.iloc[0]["종목명"] if not row.empty else code
-            removed_list.append({"code": code, "name": name})
+            name = prev_df["종목명"].iat[prev["codes"][code]]
+            removed_list.append({"code": code, "name": None if pd.isna(name) else name})
 
         result[screen] = {
             "added": added_list,
@@ -356,27 +651,7 @@ def api_batch_changes():
 @app.route("/api/stocks/<code>/financials")
 def api_stock_financials(code: str):
     """연간 재무제표 시계열 (차트용: 매출액/영업이익/당기순이익)"""
-    df = _db.load_stock_financials(code)
-    if df.empty:
-        return jsonify({"years": [], "series": []})
-
-    df["year"] = df["기준일"].astype(str).str[:4]
-    all_years = sorted(df["year"].unique())
-
-    series_data: dict = {}
-    for _, row in df.iterrows():
-        acc = row["계정"]
-        yr = row["year"]
-        if acc not in series_data:
-            series_data[acc] = {}
-        series_data[acc][yr] = _safe_val(row["값"])
-
-    series = [
-        {"name": acc, "data": [series_data[acc].get(y) for y in all_years]}
-        for acc in ["매출액", "영업이익", "당기순이익"]
-        if acc in series_data
-    ]
-    return jsonify({"years": all_years, "series": series})
+    return jsonify(_get_financials_for_code(code))
 
 
 def _get_financials_for_code(code: str) -> dict:
@@ -384,19 +659,16 @@ def _get_financials_for_code(code: str) -> dict:
     df = _db.load_stock_financials(code)
     if df.empty:
         return {"years": [], "series": []}
-    df["year"] = df["기준일"].astype(str).str[:4]
-    all_years = sorted(df["year"].unique())
-    series_data: dict = {}
-    for _, row in df.iterrows():
-        acc = row["계정"]
-        yr = row["year"]
-        if acc not in series_data:
-            series_data[acc] = {}
-        series_data[acc][yr] = _safe_val(row["값"])
+    years = df["기준일"].astype(str).str[:4]
+    all_years = sorted(years.unique())
+    # iterrows 대신 컬럼 배열을 한 번에 zip (같은 계정·연도는 뒤 행이 덮어씀, NaN → None)
+    values = df["값"].astype(object).where(df["값"].notna(), None).tolist()
+    cells = dict(zip(zip(df["계정"], years), values))
+    accounts = set(df["계정"])
     series = [
-        {"name": acc, "data": [series_data[acc].get(y) for y in all_years]}
+        {"name": acc, "data": [cells.get((acc, y)) for y in all_years]}
         for acc in ["매출액", "영업이익", "당기순이익"]
-        if acc in series_data
+        if acc in accounts
     ]
     return {"years": all_years, "series": series}
 
@@ -470,16 +742,17 @@ def api_stocks_compare():
     if len(codes) > 8:
         return jsonify({"error": "최대 8개 종목까지 비교 가능합니다."}), 400
 
-    df = _load_data()
+    cache = _current_cache()
+    df = cache["df"]
     if df.empty:
         return jsonify({"error": "데이터가 없습니다."}), 404
 
-    matched = df[df["종목코드"].isin(codes)]
+    display = cache["display"]
+    matched = display[df["종목코드"].isin(codes).to_numpy()]
     if matched.empty:
         return jsonify({"error": "해당 종목을 찾을 수 없습니다."}), 404
 
-    available = [c for c in DISPLAY_COLS if c in matched.columns]
-    stocks = [_row_to_dict(row, available) for _, row in matched.iterrows()]
+    stocks = _records(matched, list(display.columns))
 
     # 재무 시계열 데이터
     financials = {}
@@ -537,16 +810,19 @@ def api_generate_report(code: str):
     if not config.ANTHROPIC_API_KEY:
         return jsonify({"error": "ANTHROPIC_API_KEY가 설정되지 않았습니다."}), 500
 
-    df = _load_data()
+    cache = _current_cache()
+    df = cache["df"]
     if df.empty:
         return jsonify({"error": "데이터 없음"}), 404
 
-    row = df[df["종목코드"] == code.zfill(6)]
-    if row.empty:
+    pos = cache["codes"].get(code.zfill(6))
+    if pos is None:
         return jsonify({"error": "종목을 찾을 수 없습니다."}), 404
 
-    stock_data = {c: _safe_val(row.iloc[0].get(c)) for c in df.columns}
+    stock_data = _records(df.iloc[pos : pos + 1], list(df.columns))[0]
 
+    if not _report_sem.acquire(blocking=False):
+        return jsonify({"error": "다른 보고서를 생성 중입니다. 잠시 후 다시 시도하세요."}), 429
     try:
         result = generate_report(stock_data)
 
@@ -571,6 +847,8 @@ def api_generate_report(code: str):
     except Exception as e:
         log.exception("Report generation failed for %s", code)
         return jsonify({"error": str(e)}), 500
+    finally:
+        _report_sem.release()
 
 
 @app.route("/api/reports")
@@ -583,22 +861,20 @@ def api_list_reports():
 # Screening helpers (mirror quant_screener logic)
 # ─────────────────────────────────────────
 
-def _apply_screen_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
-    """Apply screening filters matching quant_screener.py logic."""
+def _screen_mask(df: pd.DataFrame, name: str) -> np.ndarray | None:
+    """Boolean mask for a screening tab, matching quant_screener.py logic (None if unknown)."""
     if name == "screened":
         mask = (
             df["TTM_순이익"].notna() & (df["TTM_순이익"] > 0)
             & (df["ROE(%)"] >= 5)
-            & df["PER"].between(1, 50)
+            & df["PER"].between(1, 50)  # PER_이상(0.5 미만·500 초과) 제외 포함
             & df["PBR"].between(0.1, 10)
             & (df["매출_연속성장"] >= 2)
             & (df["순이익_연속성장"] >= 1)
             & (df["시가총액"] >= 50_000_000_000)
             & (df["F스코어"] >= 5)
         )
-        if "PER_이상" in df.columns:
-            mask = mask & (df["PER_이상"] == "")
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
 
     elif name == "momentum":
         mask = (
@@ -609,21 +885,18 @@ def _apply_screen_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
             & (df["TTM_순이익"] > 0)
             & (df["시가총액"] >= 50_000_000_000)
         )
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
 
     elif name == "garp":
         mask = (
             df["PEG"].notna() & (df["PEG"] > 0) & (df["PEG"] < 1.5)
             & df["매출_CAGR"].notna() & (df["매출_CAGR"] >= 10)
             & df["ROE(%)"].notna() & (df["ROE(%)"] >= 12)
-            & df["PER"].notna() & df["PER"].between(5, 30)
+            & df["PER"].notna() & df["PER"].between(5, 30)  # PER_이상 제외 포함
             & (df["시가총액"] >= 50_000_000_000)
             & (df["TTM_순이익"] > 0)
         )
-        # PER_이상 컬럼이 있으면 항상 적용 (quant_screener.py와 일치)
-        if "PER_이상" in df.columns:
-            mask = mask & (df["PER_이상"] == "")
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
 
     elif name == "cashcow":
         mask = (
@@ -639,7 +912,7 @@ def _apply_screen_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
             & (df["이익품질_양호"] == 1)
             & (df["F스코어"] >= 6)
         )
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
 
     elif name == "turnaround":
         mask = (
@@ -647,7 +920,7 @@ def _apply_screen_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
             & (df["TTM_순이익"] > 0)
             & (df["시가총액"] >= 30_000_000_000)
         )
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
 
     elif name == "dividend_growth":
         mask = (
@@ -660,6 +933,48 @@ def _apply_screen_filter(df: pd.DataFrame, name: str) -> pd.DataFrame:
             & (df["TTM_순이익"] > 0)
             & (df["배당_수익동반증가"] == 1)
         )
-        return df[mask]
+        return mask.to_numpy(dtype=bool)
+
+    return None
+
+
+def _market_masks(df: pd.DataFrame) -> dict:
+    """시장별 bool 마스크 — 시장 필터가 요청마다 컬럼을 비교하지 않도록 reload 시 한 번 계산."""
+    if df.empty or "시장구분" not in df.columns:
+        return {}
+    return {mkt: (df["시장구분"] == mkt).to_numpy(dtype=bool) for mkt in MARKETS}
+
+
+def _market_summary(df: pd.DataFrame) -> list[dict]:
+    """시장별 종목 수·PER/PBR/ROE 중앙값 — 데이터가 바뀔 때만 다시 계산."""
+    if df.empty or "시장구분" not in df.columns:
+        return []
+
+    # 시장별 부분집합을 만들지 않고 groupby 한 번으로 종목 수·중앙값 집계
+    fields = {"PER": "avg_per", "PBR": "avg_pbr", "ROE(%)": "avg_roe"}
+    cols = [c for c in fields if c in df.columns]
+    grouped = df[cols].astype(float).groupby(df["시장구분"], observed=True)  # 없는 시장은 아래 reindex로 채움
+    counts = grouped.size()
+    # 없는 시장·컬럼은 NaN → 직렬화 시 None
+    medians = grouped.median().reindex(index=MARKETS, columns=list(fields)).round(4)
+    medians = _records(medians.rename(columns=fields), list(fields.values()))
+
+    return [
+        {"market": mkt, "stock_count": int(counts.get(mkt, 0)), **med}
+        for mkt, med in zip(MARKETS, medians)
+    ]
+
+
+def _screen_masks(df: pd.DataFrame) -> dict:
+    """All screening masks for a cached frame — computed once per reload, not per request."""
+    if df.empty:
+        return {}
+    masks = {}
+    for name in SCREENS:
+        try:
+            masks[name] = _screen_mask(df, name)
+        except KeyError as e:
+            # 스키마가 다른 테이블(주로 이전 배치) — 해당 탭만 빼고 나머지 캐시는 그대로 사용
+            log.warning("Screen '%s' unavailable, missing column %s", name, e)
+    return masks
 
-    return df
@@ -801,6 +801,7 @@
       size: pageSize,
       sort: sortCol,
       order: sortOrder === "none" ? "desc" : sortOrder,
+      format: "columns",
     });
     if (market) params.set("market", market);
     if (q) params.set("q", q);
@@ -820,7 +821,9 @@
     try {
       const res = await fetch(`/api/stocks?${params}`);
       const data = await res.json();
-      renderTable(data.items);
+      // 컬럼형 응답(columns + data 행 배열) → 행 객체
+      const items = (data.data || []).map(row => Object.fromEntries(data.columns.map((c, i) => [c, row[i]])));
+      renderTable(items);
       renderPagination(data.total, data.page, data.size);
     } catch (e) {
       console.error("Load error", e);